@@ -91,7 +91,7 @@ class Kind(Enum):
         return self == Kind.INTERFACE
 
     def is_class_or_struct(self) -> bool:
-        return self in [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE]
+        return self.flag & CLASS_OR_STRUCT_KINDS != 0
 
     def is_typedef(self) -> bool:
         return self == Kind.TYPEDEF
@@ -124,37 +124,13 @@ class Kind(Enum):
         return self == Kind.EXAMPLE
 
     def is_language(self) -> bool:
-        LANGUAGE = [
-            Kind.FUNCTION,
-            Kind.VARIABLE,
-            Kind.NAMESPACE,
-            Kind.DEFINE,
-            Kind.CLASS,
-            Kind.STRUCT,
-            Kind.TYPEDEF,
-            Kind.ENUM,
-            Kind.ENUMVALUE,
-            Kind.UNION,
-            Kind.INTERFACE,
-            Kind.FRIEND,
-            Kind.SIGNAL,
-            Kind.SLOT,
-            Kind.PROPERTY,
-        ]
-
-        return self in LANGUAGE
+        return self.flag & LANGUAGE_KINDS != 0
 
     def is_parent(self) -> bool:
-        return self in [
-            Kind.NAMESPACE,
-            Kind.CLASS,
-            Kind.STRUCT,
-            Kind.UNION,
-            Kind.INTERFACE,
-        ]
+        return self.flag & PARENT_KINDS != 0
 
     def is_member(self) -> bool:
-        return self.is_language() and not self.is_parent()
+        return self.flag & MEMBER_KINDS != 0
 
     @staticmethod
     def from_str(s: str) -> "Kind":
@@ -164,6 +140,49 @@ class Kind(Enum):
             return Kind.NONE
 
 
+# One bit per kind (Kind.flag) and masks of kind categories, so that classifying a kind or a node (Node.flags)
+# is a single bitwise test instead of a chain of comparisons.
+for _bit, _kind in enumerate(Kind):
+    _kind.flag = 1 << _bit
+del _bit, _kind
+
+
+def kind_mask(*kinds: Kind) -> int:
+    mask = 0
+    for kind in kinds:
+        mask |= kind.flag
+    return mask
+
+
+LANGUAGE_KINDS = kind_mask(
+    Kind.FUNCTION,
+    Kind.VARIABLE,
+    Kind.NAMESPACE,
+    Kind.DEFINE,
+    Kind.CLASS,
+    Kind.STRUCT,
+    Kind.TYPEDEF,
+    Kind.ENUM,
+    Kind.ENUMVALUE,
+    Kind.UNION,
+    Kind.INTERFACE,
+    Kind.FRIEND,
+    Kind.SIGNAL,
+    Kind.SLOT,
+    Kind.PROPERTY,
+)
+PARENT_KINDS = kind_mask(Kind.NAMESPACE, Kind.CLASS, Kind.STRUCT, Kind.UNION, Kind.INTERFACE)
+MEMBER_KINDS = LANGUAGE_KINDS & ~PARENT_KINDS
+CLASS_OR_STRUCT_KINDS = kind_mask(Kind.CLASS, Kind.STRUCT, Kind.INTERFACE)
+FILE_OR_DIR_KINDS = kind_mask(Kind.FILE, Kind.DIR)
+# kinds walked into when searching the tree: parents, directories and files
+CONTAINER_KINDS = PARENT_KINDS | FILE_OR_DIR_KINDS
+# compounds documented on a page with their members (and linked to their source page)
+COMPOUND_KINDS = CONTAINER_KINDS | kind_mask(Kind.GROUP)
+# kinds with a page of their own in the full documentation, other nodes are anchors on the page of their parent
+OWN_PAGE_KINDS = COMPOUND_KINDS | kind_mask(Kind.PAGE)
+
+
 class Visibility(Enum):
     PUBLIC = "public"
     PACKAGE = "package"
@@ -0,0 +1,109 @@
+"""@package mkdoxy.dependencies
+Dependencies of generated pages on Doxygen compounds, used for incremental builds.
+
+A page fingerprint combines the XML hashes of every compound the page reads: the compound itself,
+its parents (breadcrumbs), all base classes and every compound referenced from its XML (links, derived
+classes, inner classes). Pages that are not bound to a single compound (indexes, lists) depend on all
+compounds.
+"""
+
+import hashlib
+import json
+from importlib import metadata
+from pathlib import Path
+from typing import Callable
+
+from mkdoxy.doxygen import Doxygen
+from mkdoxy.node import Node
+
+
+def mkdoxy_version() -> str:
+    try:
+        return metadata.version("mkdoxy")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+class PageDependencies:
+    """! Fingerprints of generated pages computed from the compounds they depend on."""
+
+    def __init__(self, doxygen: Doxygen, xmlPath: str, salt: str = ""):
+        """! Constructor.
+        @details Hashes all compound XML files of the project.
+        @param doxygen (Doxygen): Parsed Doxygen project.
+        @param xmlPath (str): Path to the Doxygen XML output.
+        @param salt (str): Anything else the pages depend on (templates, settings).
+        """
+        self.doxygen = doxygen
+        self.salt = f"{mkdoxy_version()}\n{salt}"
+        self.compoundHashes: dict[str, str] = {}
+        for path in sorted(Path(xmlPath).glob("*.xml")):
+            if path.name != "index.xml":
+                self.compoundHashes[path.stem] = hashlib.sha1(path.read_bytes()).hexdigest()
+        self.allCompounds = hashlib.sha1(json.dumps(self.compoundHashes, sort_keys=True).encode()).hexdigest()
+        self._compounds: dict[str, str] = {}
+
+    def compound(self, refid: str) -> str:
+        """! Find the compound defining a compound or member refid.
+        @details
+        @param refid (str): Refid of a compound or member.
+        @return (str): Refid of the compound or None for unknown symbols.
+        """
+        if refid in self.compoundHashes:
+            return refid
+        if refid not in self._compounds:
+            try:
+                node = self.doxygen.ctx.cache.get(refid)
+            except IndexError:
+                node = None
+            while node is not None and node.refid not in self.compoundHashes:
+                node = node.parent
+            self._compounds[refid] = node.refid if node is not None else None
+        return self._compounds[refid]
+
+    def dependencies(self, node: Node) -> set[str]:
+        """! Compounds a page of the node reads.
+        @details
+        @param node (Node): Node rendered on the page.
+        @return (set[str]): Refids of the compounds.
+        """
+        refids = set(node.references)
+        refids.update(parent.refid for parent in node.parents)
+
+        # inherited members of all base classes are listed on the page
+        visited = {node.refid}
+        derived = [node]
+        while derived:
+            current = derived.pop()
+            if not current.is_parent:
+                continue
+            for base in current.base_classes:
+                if isinstance(base, Node) and base.refid not in visited:
+                    visited.add(base.refid)
+                    refids.add(base.refid)
+                    derived.append(base)
+
+        compounds = {self.compound(refid) for refid in refids}
+        compounds.add(self.compound(node.refid))
+        compounds.discard(None)
+        return compounds
+
+    def fingerprint(self, path: str, render: Callable[..., str], args: tuple) -> str:
+        """! Fingerprint of a page, it changes when any input of the page changes.
+        @details
+        @param path (str): Path of the page.
+        @param render (Callable): Render function of the page.
+        @param args (tuple): Arguments of the render function.
+        @return (str): Fingerprint.
+        """
+        sha1 = hashlib.sha1()
+        settings = [arg for arg in args if isinstance(arg, (dict, str))]
+        sha1.update(f"{self.salt}\n{path}\n{render.__name__}\n".encode())
+        sha1.update(json.dumps(settings, sort_keys=True, default=str).encode())
+
+        if args and isinstance(args[0], Node):
+            for refid in sorted(self.dependencies(args[0])):
+                sha1.update(f"\n{refid}:{self.compoundHashes.get(refid, '')}".encode())
+        else:
+            sha1.update(self.allCompounds.encode())
+        return sha1.hexdigest()
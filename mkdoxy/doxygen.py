@@ -14,6 +14,7 @@ log: logging.Logger = logging.getLogger("mkdocs")
 class Doxygen:
     def __init__(self, index_path: str, parser: XmlParser, cache: Cache):
         self.debug = parser.debug
+        self.index_path = index_path
         path_xml = os.path.join(index_path, "index.xml")
         if self.debug:
             log.info(f"Loading XML from: {path_xml}")
@@ -125,7 +126,7 @@ class Doxygen:
     def _remove_from_root(self, refid: str, root: Node):
         for i, child in enumerate(root.children):
             if child.refid == refid:
-                root.children.pop(i)
+                root.remove_child(i)
                 return
 
     def _fix_duplicates(self, node: Node, root: Node, filter: [Kind]):
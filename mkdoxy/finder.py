@@ -1,17 +1,94 @@
 from typing import Dict
 
-from mkdoxy.constants import Kind
+from mkdoxy.constants import CONTAINER_KINDS, Kind
 from mkdoxy.doxygen import Doxygen
-from mkdoxy.utils import recursive_find, recursive_find_with_parent
+from mkdoxy.node import Node
+from mkdoxy.utils import recursive_find
+
+
+def _normalize(name: str) -> str:
+    return name.replace(" ", "")
+
+
+class FinderIndex:
+    """! Symbol lookup tables of one project.
+    @details The root and files trees are walked once, all later lookups are dictionary queries.
+    """
+
+    def __init__(self, doxygen: Doxygen):
+        self.parents: Dict[Kind, list[Node]] = {}
+        self.functions: list[Node] = []
+        self.files: list[Node] = []
+        self._parentsByName: Dict[Kind, Dict[str, Node]] = {}
+        self._members: Dict[tuple[str, Kind], list[tuple[str, Node]]] = {}
+        self._functionsByName: Dict[str, Node] = None
+        self._filesByName: Dict[str, Node] = None
+
+        self._walk_root(doxygen.root.children)
+        self._walk_files(doxygen.files.children)
+
+    def _walk_root(self, nodes: [Node]):
+        for node in nodes:
+            if node.kind.is_parent():
+                self.parents.setdefault(node.kind, []).append(node)
+                self._walk_root(node.children)
+
+    def _walk_files(self, nodes: [Node]):
+        for node in nodes:
+            parent = node.parent
+            if parent is not None:
+                if node.kind == Kind.FUNCTION and parent.kind == Kind.FILE:
+                    self.functions.append(node)
+                elif node.kind == Kind.FILE and parent.kind == Kind.DIR:
+                    self.files.append(node)
+            if node.kind.flag & CONTAINER_KINDS:
+                self._walk_files(node.children)
+
+    def parent(self, kind: Kind, name: str) -> Node:
+        if kind not in self._parentsByName:
+            byName = {}
+            for node in self.parents.get(kind, []):
+                byName.setdefault(node.name_long, node)
+            self._parentsByName[kind] = byName
+        return self._parentsByName[kind].get(name)
+
+    def members(self, parent: Node, kind: Kind) -> list[tuple[str, Node]]:
+        key = (parent.refid, kind)
+        if key not in self._members:
+            self._members[key] = [
+                (_normalize(member.name_params), member) for member in recursive_find(parent.children, kind)
+            ]
+        return self._members[key]
+
+    def function(self, name: str) -> Node:
+        if self._functionsByName is None:
+            self._functionsByName = {}
+            for function in self.functions:
+                self._functionsByName.setdefault(_normalize(function.name_params), function)
+        return self._functionsByName.get(_normalize(name))
+
+    def file(self, name: str) -> Node:
+        if self._filesByName is None:
+            self._filesByName = {}
+            for file in self.files:
+                self._filesByName.setdefault(_normalize(file.name_long), file)
+        return self._filesByName.get(_normalize(name))
 
 
 class Finder:
     def __init__(self, doxygen: Dict[str, Doxygen], debug: bool = False):
         self.doxygen = doxygen
         self.debug = debug
+        self.indexes: Dict[str, FinderIndex] = {}
+
+    def index(self, project) -> FinderIndex:
+        """! Lookup tables of a project, built on first use and shared by all later queries."""
+        if project not in self.indexes:
+            self.indexes[project] = FinderIndex(self.doxygen[project])
+        return self.indexes[project]
 
     def _normalize(self, name: str) -> str:
-        return name.replace(" ", "")
+        return _normalize(name)
 
     def listToNames(self, list):
         return [part.name_params for part in list]
@@ -19,11 +96,12 @@ class Finder:
     def _doxyParent(self, project, parent: str, kind: Kind):
         if not kind.is_parent():
             return None
-        parents = recursive_find(self.doxygen[project].root.children, kind)
+        index = self.index(project)
+        parents = index.parents.get(kind)
         if parents:
-            for findParent in parents:
-                if findParent.name_long == parent:
-                    return findParent
+            findParent = index.parent(kind, parent)
+            if findParent is not None:
+                return findParent
             return self.listToNames(parents)
         return None
 
@@ -36,12 +114,13 @@ class Finder:
                         return member
                 return findParent
             else:
-                members = recursive_find(findParent.children, memberKind)
+                members = self.index(project).members(findParent, memberKind)
                 if members:
-                    for member in members:
-                        if self._normalize(memberName) in self._normalize(member.name_params):
+                    normalized = self._normalize(memberName)
+                    for name, member in members:
+                        if normalized in name:
                             return member
-                    return self.listToNames(members)
+                    return self.listToNames(member for _, member in members)
                 return None
         return None
 
@@ -58,19 +137,19 @@ class Finder:
         return self._doxyMemberInParent(project, namespace, Kind.NAMESPACE, functionName, Kind.FUNCTION)
 
     def doxyFunction(self, project, functionName: str):
-        functions = recursive_find_with_parent(self.doxygen[project].files.children, [Kind.FUNCTION], [Kind.FILE])
-        if functions:
-            for function in functions:
-                if self._normalize(functionName) == self._normalize(function.name_params):
-                    return function
-            return self.listToNames(functions)
+        index = self.index(project)
+        if index.functions:
+            function = index.function(functionName)
+            if function is not None:
+                return function
+            return self.listToNames(index.functions)
         return None
 
     def doxyCode(self, project, fileName):
-        files = recursive_find_with_parent(self.doxygen[project].files.children, [Kind.FILE], [Kind.DIR])
-        if files:
-            for file in files:
-                if self._normalize(fileName) == self._normalize(file.name_long):
-                    return file
-            return self.listToNames(files)
+        index = self.index(project)
+        if index.files:
+            file = index.file(fileName)
+            if file is not None:
+                return file
+            return self.listToNames(index.files)
         return None
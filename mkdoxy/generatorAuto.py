@@ -1,12 +1,20 @@
+import hashlib
+import json
 import logging
 import os
+import time
+from typing import Callable, Iterable, Union
 
 from mkdocs.structure import files
 
-from mkdoxy.constants import Kind
+from mkdoxy.constants import COMPOUND_KINDS, FILE_OR_DIR_KINDS, LANGUAGE_KINDS, Kind
+from mkdoxy.dependencies import PageDependencies
 from mkdoxy.doxygen import Doxygen
 from mkdoxy.generatorBase import GeneratorBase
 from mkdoxy.node import Node
+from mkdoxy.parallel import map_parallel
+from mkdoxy.renderStats import Key, nodeKind
+from mkdoxy.utils import recursive_find_many
 
 log: logging.Logger = logging.getLogger("mkdocs")
 
@@ -27,6 +35,32 @@ ADDITIONAL_FILES = {
 }
 
 
+CLASS_KINDS = [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE]
+MEMBER_KINDS = [Kind.FUNCTION, Kind.VARIABLE, Kind.TYPEDEF, Kind.ENUM]
+
+# classes, structs and interfaces in the order of GeneratorBase.find_classes
+CLASS_FILTERS = [([kind], None) for kind in CLASS_KINDS]
+
+# (title, kinds, parent kinds) of the index pages
+ROOT_INDEX_PAGES = [
+    ("Class Members", MEMBER_KINDS, CLASS_KINDS),
+    ("Class Member Functions", [Kind.FUNCTION], CLASS_KINDS),
+    ("Class Member Variables", [Kind.VARIABLE], CLASS_KINDS),
+    ("Class Member Typedefs", [Kind.TYPEDEF], CLASS_KINDS),
+    ("Class Member Enums", [Kind.ENUM], CLASS_KINDS),
+    ("Namespace Members", MEMBER_KINDS, [Kind.NAMESPACE]),
+    ("Namespace Member Functions", [Kind.FUNCTION], [Kind.NAMESPACE]),
+    ("Namespace Member Variables", [Kind.VARIABLE], [Kind.NAMESPACE]),
+    ("Namespace Member Typedefs", [Kind.TYPEDEF], [Kind.NAMESPACE]),
+    ("Namespace Member Enums", [Kind.ENUM], [Kind.NAMESPACE]),
+]
+FILES_INDEX_PAGES = [
+    ("Functions", [Kind.FUNCTION], [Kind.FILE]),
+    ("Macros", [Kind.DEFINE], [Kind.FILE]),
+    ("Variables", [Kind.VARIABLE, Kind.UNION, Kind.TYPEDEF, Kind.ENUM], [Kind.FILE]),
+]
+
+
 def generate_link(name, url, end="\n") -> str:
     def normalize(name):
         return "\\" + name if name.startswith("__") else name
@@ -47,6 +81,9 @@ class GeneratorAuto:
         apiPath: str,
         doxygen: Doxygen,
         useDirectoryUrls: bool,
+        parallel: bool = False,
+        workers: int = 0,
+        incremental: bool = False,
     ):
         self.generatorBase = generatorBase
         self.tempDoxyDir = tempDoxyDir
@@ -56,147 +93,224 @@ class GeneratorAuto:
         self.useDirectoryUrls = useDirectoryUrls
         self.fullDocFiles = []
         self.debug = generatorBase.debug
+        self.parallel = parallel  # render full documentation pages in worker processes
+        self.workers = workers
+        self.incremental = incremental  # render only pages whose dependencies changed
+        self.jobs: list[tuple[str, Callable[..., str], tuple]] = None
+        self.changedFiles: set[str] = set()  # src_uri of pages whose content changed in this build
+        self.hashFilePath = os.path.join(self.tempDoxyDir, "hashPages.json")
+        self.hashesOld: dict[str, str] = self.hashRead(self.hashFilePath)
+        self.hashes: dict[str, str] = {}
+        self.dependenciesFilePath = os.path.join(self.tempDoxyDir, "hashDependencies.json")
+        self.fingerprintsOld: dict[str, str] = self.hashRead(self.dependenciesFilePath) if incremental else {}
+        self.fingerprints: dict[str, str] = {}
         os.makedirs(os.path.join(self.tempDoxyDir, self.apiPath), exist_ok=True)
 
-    def save(self, path: str, output: str):
-        pathRel = os.path.join(self.apiPath, path)
-        self.fullDocFiles.append(files.File(pathRel, self.tempDoxyDir, self.siteDir, self.useDirectoryUrls))
-        with open(os.path.join(self.tempDoxyDir, pathRel), "w", encoding="utf-8") as file:
-            file.write(output)
+    def hashRead(self, path: str) -> dict[str, str]:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def hashWrite(self):
+        with open(self.hashFilePath, "w", encoding="utf-8") as file:
+            json.dump(self.hashes, file, indent=0, sort_keys=True)
+        # without incremental mode the pages are not tracked, stale fingerprints must not survive
+        with open(self.dependenciesFilePath, "w", encoding="utf-8") as file:
+            json.dump(self.fingerprints, file, indent=0, sort_keys=True)
+
+    def pageFile(self, path: str) -> files.File:
+        return files.File(os.path.join(self.apiPath, path), self.tempDoxyDir, self.siteDir, self.useDirectoryUrls)
+
+    def save(self, path: str, output: Union[str, Iterable[str]], statsKey: Key = ("page", "-", "-")):
+        """! Save a page.
+        @param path: (str) Path of the page relative to the API directory.
+        @param output: (str | Iterable[str]) The page or its chunks.
+        @param statsKey: (Key) Key of the page in the render stats, see statsKey.
+        """
+        file = self.pageFile(path)
+        self.fullDocFiles.append(file)
+        start = time.perf_counter()
+        if isinstance(output, str):
+            size = self.saveString(file, output)
+        else:
+            size = self.saveStream(file, output)
+        if self.generatorBase.stats is not None:
+            self.generatorBase.stats.record(statsKey, time.perf_counter() - start, size)
+
+    def saveString(self, file: files.File, output: str) -> int:
+        # keep the file untouched (and its mtime) if the content did not change since the last build
+        encoded = output.encode("utf-8")
+        hash = hashlib.sha1(encoded).hexdigest()
+        self.hashes[file.src_uri] = hash
+        if self.hashesOld.get(file.src_uri) == hash and os.path.isfile(file.abs_src_path):
+            return len(encoded)
+
+        with open(file.abs_src_path, "w", encoding="utf-8") as f:
+            f.write(output)
+        self.hashesOld[file.src_uri] = hash
+        self.changedFiles.add(file.src_uri)
+        return len(encoded)
+
+    def saveStream(self, file: files.File, chunks: Iterable[str]) -> int:
+        """! Write a page chunk by chunk, so a page streamed by GeneratorBase is never held in memory as a whole.
+        @details Only serially rendered pages are streamed, pages rendered by parallel workers arrive as whole strings.
+        The page goes to a temporary file that replaces the page only if its content changed.
+        The temporary file is removed if rendering fails.
+        """
+        hash = hashlib.sha1()
+        size = 0
+        tempPath = f"{file.abs_src_path}.tmp"
+        with open(tempPath, "w", encoding="utf-8") as f:
+            try:
+                for chunk in chunks:
+                    encoded = chunk.encode("utf-8")
+                    hash.update(encoded)
+                    size += len(encoded)
+                    f.write(chunk)
+            except BaseException:
+                f.close()
+                os.remove(tempPath)
+                raise
+
+        hash = hash.hexdigest()
+        self.hashes[file.src_uri] = hash
+        if self.hashesOld.get(file.src_uri) == hash and os.path.isfile(file.abs_src_path):
+            os.remove(tempPath)
+            return size
+
+        os.replace(tempPath, file.abs_src_path)
+        self.hashesOld[file.src_uri] = hash
+        self.changedFiles.add(file.src_uri)
+        return size
+
+    @staticmethod
+    def statsKey(render: Callable[..., str], args: tuple) -> Key:
+        return "page", render.__name__, nodeKind(args[0] if args else None)
+
+    def keep(self, file: files.File):
+        """! Register a page generated by a previous build without rendering it again."""
+        self.fullDocFiles.append(file)
+        self.hashes[file.src_uri] = self.hashesOld[file.src_uri]
+
+    def schedule(self, path: str, render: Callable[..., str], *args):
+        """! Render a page and save it.
+        @details While fullDoc runs, the page is only queued and rendered by renderJobs.
+        @param path: (str) Path of the page relative to the API directory.
+        @param render: (Callable) Render function of GeneratorBase.
+        @param args: Arguments of the render function.
+        """
+        if self.jobs is None:
+            self.save(path, render(*args), self.statsKey(render, args))
+        else:
+            self.jobs.append((path, render, args))
+
+    def renderJobs(self):
+        """! Render and save all queued pages, in worker processes in parallel mode.
+        @details A page queued more than once is rendered only once, from its last job (the last save used to win),
+        at the position of its first job. Pages are saved in that order.
+        In incremental mode, pages whose dependencies did not change since the last build are kept as they are.
+        """
+        latest = {}
+        for job in self.jobs:
+            latest[job[0]] = job
+        jobs = list(latest.values())
+        self.jobs = None
+
+        unchanged = [None] * len(jobs)  # file of a page that can be kept
+        if self.incremental:
+            dependencies = PageDependencies(
+                self.doxygen, self.doxygen.index_path, salt=self.generatorBase.templatesHash
+            )
+            for index, (path, render, args) in enumerate(jobs):
+                fingerprint = dependencies.fingerprint(path, render, args)
+                self.fingerprints[path] = fingerprint
+                file = self.pageFile(path)
+                if (
+                    self.fingerprintsOld.get(path) == fingerprint
+                    and file.src_uri in self.hashesOld
+                    and os.path.isfile(file.abs_src_path)
+                ):
+                    unchanged[index] = file
+            log.info(f"  -> {unchanged.count(None)} of {len(jobs)} pages have changed dependencies")
+
+        toRender = [job for job, file in zip(jobs, unchanged) if file is None]
+        if self.parallel:
+
+            def render(index: int) -> str:
+                _, renderFunction, args = toRender[index]
+                return renderFunction(*args)
+
+            log.info(f"  -> rendering {len(toRender)} pages in parallel")
+            outputs = iter(map_parallel(render, len(toRender), self.workers, self.generatorBase.stats))
+        else:
+            outputs = (renderFunction(*args) for _, renderFunction, args in toRender)
+
+        # pages rendered here are written while they are rendered, workers return whole pages
+        with self.generatorBase.streaming():
+            for (path, renderFunction, args), file in zip(jobs, unchanged):
+                if file is None:
+                    self.save(path, next(outputs), self.statsKey(renderFunction, args))
+                else:
+                    self.keep(file)
 
     def fullDoc(self, defaultTemplateConfig: dict):
+        self.jobs = []
+
+        # collect nodes of all index pages in one pass over each tree
+        rootFound = recursive_find_many(
+            self.doxygen.root.children,
+            CLASS_FILTERS + [(kinds, parents) for _, kinds, parents in ROOT_INDEX_PAGES],
+        )
+        classes = [node for found in rootFound[: len(CLASS_FILTERS)] for node in found]
+        rootIndexes = rootFound[len(CLASS_FILTERS) :]
+        filesIndexes = recursive_find_many(
+            self.doxygen.files.children,
+            [(kinds, parents) for _, kinds, parents in FILES_INDEX_PAGES],
+        )
+
         self.annotated(self.doxygen.root.children, defaultTemplateConfig)
         self.fileindex(self.doxygen.files.children, defaultTemplateConfig)
         self.members(self.doxygen.root.children, defaultTemplateConfig)
         self.members(self.doxygen.groups.children, defaultTemplateConfig)
         self.files(self.doxygen.files.children, defaultTemplateConfig)
         self.namespaces(self.doxygen.root.children, defaultTemplateConfig)
-        self.classes(self.doxygen.root.children, defaultTemplateConfig)
-        self.hierarchy(self.doxygen.root.children, defaultTemplateConfig)
+        self.classes(self.doxygen.root.children, defaultTemplateConfig, classes)
+        self.hierarchy(self.doxygen.root.children, defaultTemplateConfig, classes)
         self.modules(self.doxygen.groups.children, defaultTemplateConfig)
         self.pages(self.doxygen.pages.children, defaultTemplateConfig)
         # self.examples(self.doxygen.examples.children) # TODO examples
         self.relatedpages(self.doxygen.pages.children)
-        self.index(
-            self.doxygen.root.children,
-            [Kind.FUNCTION, Kind.VARIABLE, Kind.TYPEDEF, Kind.ENUM],
-            [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE],
-            "Class Members",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.FUNCTION],
-            [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE],
-            "Class Member Functions",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.VARIABLE],
-            [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE],
-            "Class Member Variables",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.TYPEDEF],
-            [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE],
-            "Class Member Typedefs",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.ENUM],
-            [Kind.CLASS, Kind.STRUCT, Kind.INTERFACE],
-            "Class Member Enums",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.FUNCTION, Kind.VARIABLE, Kind.TYPEDEF, Kind.ENUM],
-            [Kind.NAMESPACE],
-            "Namespace Members",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.FUNCTION],
-            [Kind.NAMESPACE],
-            "Namespace Member Functions",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.VARIABLE],
-            [Kind.NAMESPACE],
-            "Namespace Member Variables",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.TYPEDEF],
-            [Kind.NAMESPACE],
-            "Namespace Member Typedefs",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.root.children,
-            [Kind.ENUM],
-            [Kind.NAMESPACE],
-            "Namespace Member Enums",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.files.children,
-            [Kind.FUNCTION],
-            [Kind.FILE],
-            "Functions",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.files.children,
-            [Kind.DEFINE],
-            [Kind.FILE],
-            "Macros",
-            defaultTemplateConfig,
-        )
-        self.index(
-            self.doxygen.files.children,
-            [Kind.VARIABLE, Kind.UNION, Kind.TYPEDEF, Kind.ENUM],
-            [Kind.FILE],
-            "Variables",
-            defaultTemplateConfig,
-        )
+        for (title, _, _), found in zip(ROOT_INDEX_PAGES + FILES_INDEX_PAGES, rootIndexes + filesIndexes):
+            self.index_found(found, title, defaultTemplateConfig)
+
+        self.renderJobs()
+        self.hashWrite()
 
     def annotated(self, nodes: [Node], config: dict = None):
         path = "annotated.md"
-        output = self.generatorBase.annotated(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.annotated, nodes, config)
 
     def programlisting(self, node: [Node], config: dict = None):
         path = f"{node.refid}_source.md"
 
-        output = self.generatorBase.programlisting(node, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.programlisting, node, config)
 
     def fileindex(self, nodes: [Node], config: dict = None):
         path = "files.md"
 
-        output = self.generatorBase.fileindex(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.fileindex, nodes, config)
 
     def namespaces(self, nodes: [Node], config: dict = None):
         path = "namespaces.md"
 
-        output = self.generatorBase.namespaces(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.namespaces, nodes, config)
 
     def page(self, node: Node, config: dict = None):
         path = f"{node.name}.md"
 
-        output = self.generatorBase.page(node, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.page, node, config)
 
     def pages(self, nodes: [Node], config: dict = None):
         for node in nodes:
@@ -205,14 +319,12 @@ class GeneratorAuto:
     def relatedpages(self, nodes: [Node], config: dict = None):
         path = "pages.md"
 
-        output = self.generatorBase.relatedpages(nodes)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.relatedpages, nodes)
 
     def example(self, node: Node, config: dict = None):
         path = f"{node.refid}.md"
 
-        output = self.generatorBase.example(node, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.example, node, config)
 
     def examples(self, nodes: [Node], config: dict = None):
         for node in nodes:
@@ -223,56 +335,50 @@ class GeneratorAuto:
 
         path = "examples.md"
 
-        output = self.generatorBase.examples(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.examples, nodes, config)
 
-    def classes(self, nodes: [Node], config: dict = None):
+    def classes(self, nodes: [Node], config: dict = None, found_classes: [Node] = None):
         path = "classes.md"
 
-        output = self.generatorBase.classes(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.classes, nodes, config, found_classes)
 
     def modules(self, nodes: [Node], config: dict = None):
         path = "modules.md"
 
-        output = self.generatorBase.modules(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.modules, nodes, config)
 
-    def hierarchy(self, nodes: [Node], config: dict = None):
+    def hierarchy(self, nodes: [Node], config: dict = None, found_classes: [Node] = None):
         path = "hierarchy.md"
 
-        output = self.generatorBase.hierarchy(nodes, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.hierarchy, nodes, config, found_classes)
 
     def member(self, node: Node, config: dict = None):
         path = node.filename
 
-        output = self.generatorBase.member(node, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.member, node, config)
 
-        if node.is_language or node.is_group or node.is_file or node.is_dir:
+        if node.flags & (LANGUAGE_KINDS | COMPOUND_KINDS):
             self.members(node.children, config)
 
     def file(self, node: Node, config: dict = None):
         path = node.filename
 
-        output = self.generatorBase.file(node, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.file, node, config)
 
         if node.is_file and node.has_programlisting:
             self.programlisting(node, config)
 
-        if node.is_file or node.is_dir:
+        if node.flags & FILE_OR_DIR_KINDS:
             self.files(node.children, config)
 
     def members(self, nodes: [Node], config: dict = None):
         for node in nodes:
-            if node.is_parent or node.is_group or node.is_file or node.is_dir:
+            if node.flags & COMPOUND_KINDS:
                 self.member(node, config)
 
     def files(self, nodes: [Node], config: dict = None):
         for node in nodes:
-            if node.is_file or node.is_dir:
+            if node.flags & FILE_OR_DIR_KINDS:
                 self.file(node, config)
 
     def index(
@@ -285,8 +391,12 @@ class GeneratorAuto:
     ):
         path = title.lower().replace(" ", "_") + ".md"
 
-        output = self.generatorBase.index(nodes, kind_filters, kind_parents, title, config)
-        self.save(path, output)
+        self.schedule(path, self.generatorBase.index, nodes, kind_filters, kind_parents, title, config)
+
+    def index_found(self, found_nodes: [Node], title: str, config: dict = None):
+        path = title.lower().replace(" ", "_") + ".md"
+
+        self.schedule(path, self.generatorBase.index_found, found_nodes, title, config)
 
     def _generate_recursive(self, output_summary: str, node: Node, level: int):
         if node.kind.is_parent():
@@ -355,4 +465,5 @@ class GeneratorAuto:
         output_summary += str(" " * (offset + 2) + generate_link("File Functions", "functions.md"))
         output_summary += str(" " * (offset + 2) + generate_link("File Macros", "macros.md"))
 
-        self.save("links.md", output_summary)
+        self.save("links.md", output_summary, ("page", "summary", "-"))
+        self.hashWrite()
@@ -1,19 +1,23 @@
+import hashlib
+import json
 import logging
 import os
+import re
 import string
-from typing import Dict
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
 
-from jinja2 import BaseLoader, Environment, Template
+from jinja2 import Template
 from jinja2.exceptions import TemplateError
 from mkdocs import exceptions
 
-import mkdoxy
 from mkdoxy.constants import Kind
-from mkdoxy.filters import use_code_language
 from mkdoxy.node import DummyNode, Node
+from mkdoxy.renderStats import Key, RenderStats, TimedTemplate, nodeKind
+from mkdoxy.templateRegistry import templateRegistry
 from mkdoxy.utils import (
     merge_two_dicts,
-    parseTemplateFile,
     recursive_find,
     recursive_find_with_parent,
 )
@@ -23,62 +27,66 @@ log: logging.Logger = logging.getLogger("mkdocs")
 
 LETTERS = string.ascii_lowercase + "~_@\\"
 
+# merged template configs kept by GeneratorBase.loadTemplateConfig, snippets bring a new config each
+MERGED_CONFIGS_LIMIT = 256
+
+# line breaks of str.splitlines, the indent filter turns them all into "\n"
+LINE_BREAKS = re.compile("\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
 
 class GeneratorBase:
     """! Base class for all generators."""
 
-    def __init__(self, templateDir: str = "", ignore_errors: bool = False, debug: bool = False):
+    def __init__(
+        self,
+        templateDir: str = "",
+        ignore_errors: bool = False,
+        debug: bool = False,
+        cacheDir: str = "",
+        stats: RenderStats = None,
+    ):
         """! Constructor.
-        @details
+        @details Templates come from the process-wide templateRegistry, only the custom templates are read per project.
         @param templateDir (str): Path to the directory with custom templates (default: "")
         @param ignore_errors (bool): If True, errors will be ignored (default: False)
         @param debug (bool): If True, debug messages will be printed (default: False)
+        @param cacheDir (str): Directory for compiled templates shared between builds (default: "" = in memory only)
+        @param stats (RenderStats): Records the time and size of each render (default: None)
         """
 
         self.debug: bool = debug  # if True, debug messages will be printed
         self.templates: Dict[str, Template] = {}
         self.metaData: Dict[str, list[str]] = {}
+        self.streamTemplates: Dict[Template, Template] = {}  # templates without their top level indent filter
+        self.streamPages: bool = False  # if True, render returns the page in chunks, see stream
+        self.mergedConfigs: Dict[tuple[str, int], tuple[dict, Template, dict]] = {}
+        self.stats: RenderStats = stats
+        self.templateNames: Dict[Template, str] = {}
+        templateSources: Dict[str, str] = dict(templateRegistry.defaults())
+        templateFiles: Dict[str, str] = {name: name for name in templateSources}  # registry names of the templates
 
-        environment = Environment(loader=BaseLoader())
-        environment.filters["use_code_language"] = use_code_language
-        # code from https://github.com/daizutabi/mkapi/blob/master/mkapi/core/renderer.py#L29-L38
-        path = os.path.join(os.path.dirname(mkdoxy.__file__), "templates")
-        ENDING = (".jinja2", ".j2", ".jinja")
-        for fileName in os.listdir(path):
-            filePath = os.path.join(path, fileName)
-
-            # accept any case of the file ending
-            if fileName.lower().endswith(ENDING):
-                with open(filePath, "r") as file:
-                    name = os.path.splitext(fileName)[0]
-                    fileTemplate, metaData = parseTemplateFile(file.read())
-                    self.templates[name] = environment.from_string(fileTemplate)
-                    self.metaData[name] = metaData
-            else:
-                log.error(
-                    f"Trying to load unsupported file '{filePath}'. Supported file ends with {ENDING}."
-                    f"Look at documentation: https://mkdoxy.kubaandrysek.cz/usage/#custom-jinja-templates."
-                )
+        templateRegistry.useCacheDir(cacheDir)
 
         # test if templateDir is existing
         if templateDir:
             if not os.path.exists(templateDir):
                 raise exceptions.ConfigurationError(f"Custom template directory '{templateDir}' does not exist.")
             # load custom templates and overwrite default templates - if they exist
-            for fileName in os.listdir(templateDir):
-                filePath = os.path.join(templateDir, fileName)
-                if fileName.lower().endswith(ENDING):
-                    with open(filePath, "r") as file:
-                        name = os.path.splitext(fileName)[0]
-                        fileTemplate, metaData = parseTemplateFile(file.read())
-                        self.templates[name] = environment.from_string(fileTemplate)
-                        self.metaData[name] = metaData
-                        log.info(f"Overwriting template '{name}' with custom template.")
-                else:
-                    log.error(
-                        f"Trying to load unsupported file '{filePath}'. Supported file ends with {ENDING}."
-                        f"Look at documentation: https://mkdoxy.kubaandrysek.cz/usage/#custom-jinja-templates."
-                    )
+            for name, source in templateRegistry.readDir(templateDir).items():
+                templateSources[name] = source
+                templateFiles[name] = os.path.join(templateDir, name)
+                log.info(f"Overwriting template '{name}' with custom template.")
+
+        for name, source in templateSources.items():
+            template, metaData, streamTemplate = templateRegistry.load(templateFiles[name], source)
+            self.templates[name] = template
+            self.templateNames[template] = name
+            self.metaData[name] = metaData
+            if streamTemplate is not None:
+                self.streamTemplates[template] = streamTemplate
+
+        # changes with any default or custom template
+        self.templatesHash: str = hashlib.sha1(json.dumps(templateSources, sort_keys=True).encode()).hexdigest()
 
     @staticmethod
     def shift_each_line(value: str, shift_char: str = "\t") -> str:
@@ -99,6 +107,25 @@ class GeneratorBase:
         metaData = self.metaData.get(name, {})
         return template, metaData
 
+    def loadTemplateConfig(self, name: str, config: dict) -> [Template, dict]:
+        """! Load a template and its config, the template metadata merged into config.
+        @details Merged configs are cached per template and config object, so all pages rendered with
+        the same config share one merged dict. Configs must not be modified after they are passed here.
+        @param name (str): Name of the template.
+        @param config (dict): Config for the template.
+        @return (Template, dict): The template and the merged config.
+        """
+        key = (name, id(config))
+        cached = self.mergedConfigs.get(key)
+        # the cache keeps config alive, so its id cannot be reused by another dict
+        if cached is None or cached[0] is not config:
+            if len(self.mergedConfigs) >= MERGED_CONFIGS_LIMIT:
+                self.mergedConfigs.clear()
+            template, metaConfig = self.loadConfigAndTemplate(name)
+            cached = (config, template, merge_two_dicts(config, metaConfig))
+            self.mergedConfigs[key] = cached
+        return cached[1], cached[2]
+
     def render(self, tmpl: Template, data: dict) -> str:
         """! Render a template with given data.
         @details
@@ -106,14 +133,67 @@ class GeneratorBase:
         @param data (dict): Data to render the template.
         @return (str): Rendered template.
         """
+        if self.streamPages:
+            return self.stream(tmpl, data)
         try:
             # if self.debug:
             # print('Generating', path) # TODO: add path to data
-            rendered: str = tmpl.render(data)
+            if self.stats is None:
+                rendered: str = tmpl.render(data)
+                return rendered
+            start = time.perf_counter()
+            rendered = tmpl.render(data)
+            self.stats.record(self.statsKey(tmpl, data), time.perf_counter() - start, len(rendered.encode("utf-8")))
             return rendered
         except TemplateError as e:
             raise Exception(str(e)) from e
 
+    def statsKey(self, tmpl: Template, data: dict) -> Key:
+        return "template", self.templateNames.get(tmpl, tmpl.name), nodeKind(data)
+
+    def nested(self, tmpl: Template):
+        """! Template for rendering inside of another template, its renders are recorded in stats."""
+        if self.stats is None:
+            return tmpl
+        return TimedTemplate(tmpl, self.templateNames.get(tmpl, tmpl.name), self.stats)
+
+    def stream(self, tmpl: Template, data: dict) -> Iterator[str]:
+        """! Render a template with given data in chunks.
+        @details The top level indent filter collects the whole page before it is applied.
+        Without indentation it only normalizes line breaks, so the page is rendered by the template
+        without the filter and the line breaks are normalized chunk by chunk. Other templates yield one chunk.
+        @param tmpl (Template): Template to render.
+        @param data (dict): Data to render the template.
+        @return (Iterator[str]): Chunks of the rendered template.
+        """
+        if self.stats is None:
+            return self._stream(tmpl, data)
+        return self.stats.timed(self.statsKey(tmpl, data), self._stream(tmpl, data))
+
+    def _stream(self, tmpl: Template, data: dict) -> Iterator[str]:
+        streamTemplate = self.streamTemplates.get(tmpl)
+        try:
+            if streamTemplate is None or data.get("config", {}).get("indent_level", 0) != 0:
+                yield tmpl.render(data)
+                return
+            pending = ""
+            for chunk in streamTemplate.generate(data):
+                chunk = pending + chunk
+                # "\r\n" can be split between two chunks, a trailing "\r" is dropped by the filter
+                pending = "\r" if chunk.endswith("\r") else ""
+                yield LINE_BREAKS.sub("\n", chunk[: len(chunk) - len(pending)])
+        except TemplateError as e:
+            raise Exception(str(e)) from e
+
+    @contextmanager
+    def streaming(self):
+        """! While active, the page render functions return the page in chunks (see stream) instead of a string."""
+        self.streamPages = True
+        try:
+            yield
+        finally:
+            self.streamPages = False
+
     def error(
         self,
         config: dict,
@@ -136,7 +216,7 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("error")
+        template, templateConfig = self.loadTemplateConfig("error", config)
 
         data = {
             "title": title,
@@ -145,7 +225,7 @@ class GeneratorBase:
             "code_header": code_header,
             "code_language": code_language,
             "snippet_code": snippet_code,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -158,10 +238,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("annotated")
+        template, templateConfig = self.loadTemplateConfig("annotated", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -174,10 +254,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("examples")
+        template, templateConfig = self.loadTemplateConfig("examples", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -190,10 +270,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("programlisting")
+        template, templateConfig = self.loadTemplateConfig("programlisting", config)
         data = {
             "node": node,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -207,12 +287,12 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("code")
+        template, templateConfig = self.loadTemplateConfig("code", config)
         # newConfig = merge_two_dicts(CODE_CONFIG, config)
 
         data = {
             "node": node,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
             "code": code,
         }
 
@@ -227,10 +307,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("files")
+        template, templateConfig = self.loadTemplateConfig("files", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -243,10 +323,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("namespaces")
+        template, templateConfig = self.loadTemplateConfig("namespaces", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -259,10 +339,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("page")
+        template, templateConfig = self.loadTemplateConfig("page", config)
         data = {
             "node": node,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -275,10 +355,10 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("example")
+        template, templateConfig = self.loadTemplateConfig("example", config)
         data = {
             "node": node,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -291,27 +371,38 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("relatedPages")
+        template, templateConfig = self.loadTemplateConfig("relatedPages", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
-    def classes(self, nodes: [Node], config: dict = None):
+    @staticmethod
+    def find_classes(nodes: [Node]) -> [Node]:
+        """! Find all classes, structs and interfaces.
+        @details
+        @param nodes ([Node]): List of nodes to search.
+        @return ([Node]): Classes first, then structs and interfaces.
+        """
+        classes = recursive_find(nodes, Kind.CLASS)
+        classes.extend(recursive_find(nodes, Kind.STRUCT))
+        classes.extend(recursive_find(nodes, Kind.INTERFACE))
+        return classes
+
+    def classes(self, nodes: [Node], config: dict = None, found_classes: [Node] = None):
         """! Render a classes page.
         @details
         @param nodes ([Node]): List of nodes to render.
         @param config (dict): Config for the template. (default: None)
+        @param found_classes ([Node]): Classes already found in nodes, see find_classes. (default: None)
         @return (str): Rendered classes page.
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("classes")
+        template, templateConfig = self.loadTemplateConfig("classes", config)
 
-        classes = recursive_find(nodes, Kind.CLASS)
-        classes.extend(recursive_find(nodes, Kind.STRUCT))
-        classes.extend(recursive_find(nodes, Kind.INTERFACE))
+        classes = found_classes if found_classes is not None else self.find_classes(nodes)
         dictionary = {letter: [] for letter in LETTERS}
 
         for klass in classes:
@@ -324,29 +415,10 @@ class GeneratorBase:
 
         data = {
             "dictionary": dictionary,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
-    def _find_base_classes(self, nodes: [Node], derived: Node):
-        """! Find base classes of a node.
-        @details
-        @param nodes ([Node]): List of nodes to search.
-        @param derived (Node): Derived node.
-        @return ([Node]): List of base classes.
-        """
-        ret = []
-        for node in nodes:
-            if isinstance(node, str):
-                ret.append({"refid": node, "derived": derived})
-            elif node.kind.is_parent() and not node.kind.is_namespace():
-                bases = node.base_classes
-                if len(bases) == 0:
-                    ret.append(node)
-                else:
-                    ret.extend(self._find_base_classes(bases, node))
-        return ret
-
     def modules(self, nodes: [Node], config: dict = None):
         """! Render a modules page.
         @details
@@ -356,49 +428,38 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("modules")
+        template, templateConfig = self.loadTemplateConfig("modules", config)
         data = {
             "nodes": nodes,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
-    def hierarchy(self, nodes: [Node], config: dict = None):
+    def hierarchy(self, nodes: [Node], config: dict = None, found_classes: [Node] = None):
         """! Render a hierarchy page.
         @details
         @param nodes ([Node]): List of nodes to render.
         @param config (dict): Config for the template. (default: None)
+        @param found_classes ([Node]): Classes already found in nodes, see find_classes. (default: None)
         @return (str): Rendered hierarchy page.
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("hierarchy")
+        template, templateConfig = self.loadTemplateConfig("hierarchy", config)
 
-        classes = recursive_find(nodes, Kind.CLASS)
-        classes.extend(recursive_find(nodes, Kind.STRUCT))
-        classes.extend(recursive_find(nodes, Kind.INTERFACE))
-
-        bases = self._find_base_classes(classes, None)
-        deduplicated = {base.refid: base for base in bases if not isinstance(base, dict)}
-
-        for base in bases:
-            if isinstance(base, dict):
-                if base["refid"] not in deduplicated:
-                    deduplicated[base["refid"]] = []
-                deduplicated[base["refid"]].append(base)
+        classes = found_classes if found_classes is not None else self.find_classes(nodes)
 
         deduplicated_arr = []
-        for key, children in deduplicated.items():
-            if isinstance(children, list):
-                deduplicated_arr.append(DummyNode(key, list(map(lambda x: x["derived"], children)), Kind.CLASS))
-            else:
-                found: Node = next((klass for klass in classes if klass.refid == key), None)
-                if found:
-                    deduplicated_arr.append(found)
+        if classes:
+            byRefid = {klass.refid: klass for klass in classes}
+            roots, external = classes[0].project.inheritance.roots(list(byRefid))
+            deduplicated_arr = [byRefid[refid] for refid in roots if refid in byRefid]
+            for name, derived in external.items():
+                deduplicated_arr.append(DummyNode(name, derived, Kind.CLASS))
 
         data = {
             "classes": deduplicated_arr,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -411,15 +472,15 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        templateMemDef, metaConfigMemDef = self.loadConfigAndTemplate("memDef")
+        templateMemDef, configMemDef = self.loadTemplateConfig("memDef", config)
         templateCode, metaConfigCode = self.loadConfigAndTemplate("code")
 
         data = {
             "node": node,
-            "configMemDef": merge_two_dicts(config, metaConfigMemDef),
-            "templateCode": templateCode,
+            "configMemDef": configMemDef,
+            "templateCode": self.nested(templateCode),
             "configCode": metaConfigCode,
-            "config": merge_two_dicts(config, metaConfigMemDef),
+            "config": configMemDef,
         }
         return self.render(templateMemDef, data)
 
@@ -432,20 +493,20 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("member")
+        template, templateConfig = self.loadTemplateConfig("member", config)
         templateMemDef, metaConfigMemDef = self.loadConfigAndTemplate("memDef")
         templateMemTab, metaConfigMemTab = self.loadConfigAndTemplate("memTab")
         templateCode, metaConfigCode = self.loadConfigAndTemplate("code")
 
         data = {
             "node": node,
-            "templateMemDef": templateMemDef,
+            "templateMemDef": self.nested(templateMemDef),
             "configMemDef": metaConfigMemDef,
-            "templateMemTab": templateMemTab,
+            "templateMemTab": self.nested(templateMemTab),
             "configMemTab": metaConfigMemTab,
-            "templateCode": templateCode,
+            "templateCode": self.nested(templateCode),
             "configCode": metaConfigCode,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -458,17 +519,17 @@ class GeneratorBase:
         """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("member")
+        template, templateConfig = self.loadTemplateConfig("member", config)
         templateMemDef, metaConfigMemDef = self.loadConfigAndTemplate("memDef")
         templateMemTab, metaConfigMemTab = self.loadConfigAndTemplate("memTab")
 
         data = {
             "node": node,
-            "templateMemDef": templateMemDef,
+            "templateMemDef": self.nested(templateMemDef),
             "configMemDef": metaConfigMemDef,
-            "templateMemTab": templateMemTab,
+            "templateMemTab": self.nested(templateMemTab),
             "configMemTab": metaConfigMemTab,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
 
@@ -489,11 +550,21 @@ class GeneratorBase:
         @param config (dict): Config for the template. (default: None)
         @return (str): Rendered index page.
         """
+        found_nodes = recursive_find_with_parent(nodes, kind_filters, kind_parents)
+        return self.index_found(found_nodes, title, config)
+
+    def index_found(self, found_nodes: [Node], title: str, config: dict = None):
+        """! Render an index page from already collected nodes.
+        @details
+        @param found_nodes ([Node]): Nodes to list in the index, see recursive_find_many.
+        @param title (str): Title of the index page.
+        @param config (dict): Config for the template. (default: None)
+        @return (str): Rendered index page.
+        """
         if config is None:
             config = {}
-        template, metaConfig = self.loadConfigAndTemplate("index")
+        template, templateConfig = self.loadTemplateConfig("index", config)
 
-        found_nodes = recursive_find_with_parent(nodes, kind_filters, kind_parents)
         dictionary = {letter: [] for letter in LETTERS}
 
         # Sort items into the dictionary
@@ -509,21 +580,20 @@ class GeneratorBase:
         sorted_dictionary = {}
         for letter, items in dictionary.items():
             d = {}
+            seen = set()
             for item in items:
-                # The name of the item is not yet in the dictionary
-                if item.name_short not in d:
-                    d[item.name_short] = [item.parent]
-
-                else:
-                    found = any(test.refid == item.parent.refid for test in d[item.name_short])
-                    if not found:
-                        d[item.name_short].append(item.parent)
+                # Each parent is listed only once for the same name
+                key = (item.name_short, item.parent.refid)
+                if key in seen:
+                    continue
+                seen.add(key)
+                d.setdefault(item.name_short, []).append(item.parent)
 
             sorted_dictionary[letter] = d
 
         data = {
             "title": title,
             "dictionary": sorted_dictionary,
-            "config": merge_two_dicts(config, metaConfig),
+            "config": templateConfig,
         }
         return self.render(template, data)
@@ -1,3 +1,4 @@
+import bisect
 import logging
 import pathlib
 import re
@@ -9,12 +10,96 @@ from mkdoxy.doxygen import Doxygen
 from mkdoxy.finder import Finder
 from mkdoxy.generatorBase import GeneratorBase
 from mkdoxy.node import Node
+from mkdoxy.source import SourceFiles, SourceLines
 
 log: logging.Logger = logging.getLogger("mkdocs")
 
-regexIncorrect = r"(?s)(?<!```yaml\n)(^::: doxy)(\.(?P<project>[a-zA-Z0-9_]+))?[\.]?[\s]*\n(?P<yaml>.*?)\s*\n(?:(?=\n)|(?=:::)|\Z)"  # https://regex101.com/r/IYl25b/2  # noqa: E501
-regexLong = r"(?s)(?<!```yaml\n)(^::: doxy\.(?P<project>[a-zA-Z0-9_]+)\.(?P<argument>[a-zA-Z0-9_.]+))\s*\n(?P<yaml>.*?)(?:(?:(?:\r*\n)(?=\n))|(?=:::)|`|\Z)"  # https://regex101.com/r/lIgOij/4  # noqa: E501
-regexShort = r"(?s)(?<!```yaml\n)(^::: doxy\.(?P<project>[a-zA-Z0-9_]+)\.(?P<argument>[a-zA-Z0-9_.]+))\s*\n(?:(?=\n)|(?=:::)|\Z)"  # https://regex101.com/r/QnqxRc/2  # noqa: E501
+# libyaml based loader is several times faster, fall back to the pure Python one
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+regexIncorrect = re.compile(
+    r"(?s)(?<!```yaml\n)(^::: doxy)(\.(?P<project>[a-zA-Z0-9_]+))?[\.]?[\s]*\n(?P<yaml>.*?)\s*\n(?:(?=\n)|(?=:::)|\Z)",  # https://regex101.com/r/IYl25b/2  # noqa: E501
+    re.MULTILINE,
+)
+regexLong = re.compile(
+    r"(?s)(?<!```yaml\n)(^::: doxy\.(?P<project>[a-zA-Z0-9_]+)\.(?P<argument>[a-zA-Z0-9_.]+))\s*\n(?P<yaml>.*?)(?:(?:(?:\r*\n)(?=\n))|(?=:::)|`|\Z)",  # https://regex101.com/r/lIgOij/4  # noqa: E501
+    re.MULTILINE,
+)
+regexShort = re.compile(
+    r"(?s)(?<!```yaml\n)(^::: doxy\.(?P<project>[a-zA-Z0-9_]+)\.(?P<argument>[a-zA-Z0-9_.]+))\s*\n(?:(?=\n)|(?=:::)|\Z)",  # https://regex101.com/r/QnqxRc/2  # noqa: E501
+    re.MULTILINE,
+)
+
+SNIPPET_INCORRECT = "incorrect"
+SNIPPET_SHORT = "short"
+SNIPPET_LONG = "long"
+
+# order defines precedence when snippets overlap
+snippetPatterns = [
+    (SNIPPET_INCORRECT, regexIncorrect),
+    (SNIPPET_SHORT, regexShort),
+    (SNIPPET_LONG, regexLong),
+]
+
+# flat `key: scalar` snippet configs are parsed without the YAML parser
+flatYamlText = re.compile(r"[ -~\n]*")
+flatYamlLine = re.compile(r"(?P<indent> *)(?P<key>[A-Za-z_][A-Za-z0-9_-]*):(?: +(?P<value>[^ ].*?))? *")
+flatYamlInt = re.compile(r"0|-?[1-9][0-9]*")
+flatYamlPlain = re.compile(r"[A-Za-z][^#'\"]*")
+flatYamlWords = {
+    **dict.fromkeys(["true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON"], True),
+    **dict.fromkeys(["false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF"], False),
+    **dict.fromkeys(["null", "Null", "NULL", "~"], None),
+}
+
+
+def load_flat_yaml(yaml_raw: str) -> dict:
+    """! Parse a flat snippet config without a YAML parser.
+    @details Only printable ASCII with one `key: scalar` pair per line and the same indentation on all lines,
+    where the scalar is a boolean, null, decimal integer or a plain string starting with a letter.
+    The result is the same as from yaml.safe_load.
+    @param yaml_raw: (str) Raw YAML of the snippet.
+    @return: (dict) Parsed config or None if the snippet needs the full YAML parser.
+    """
+    if not flatYamlText.fullmatch(yaml_raw):
+        return None
+    config = {}
+    indent = None
+    for line in yaml_raw.split("\n"):
+        if not line.strip():
+            continue
+        match = flatYamlLine.fullmatch(line)
+        if match is None or match["key"] in flatYamlWords:
+            return None
+        if indent is None:
+            indent = match["indent"]
+        elif indent != match["indent"]:
+            return None
+
+        value = match["value"]
+        if value is None or value in flatYamlWords:
+            value = flatYamlWords.get(value)
+        elif flatYamlInt.fullmatch(value):
+            value = int(value)
+        elif not flatYamlPlain.fullmatch(value) or ": " in value or value.endswith(":"):
+            return None
+        config[match["key"]] = value
+    return config
+
+
+class Snippet:
+    """! Doxy snippet found in the page markdown."""
+
+    def __init__(self, kind: str, match: re.Match):
+        groups = match.groupdict()
+        self.kind = kind
+        self.start, self.end = match.span()
+        self.code = match.group()
+        self.project = groups.get("project")
+        self.argument = (groups.get("argument") or "").lower()
+        self.yaml = groups.get("yaml") or ""
+        # identical snippets on one page are rendered only once
+        self.key = (kind, self.code)
 
 
 class GeneratorSnippets:
@@ -28,6 +113,8 @@ class GeneratorSnippets:
         page: pages.Page,
         config: dict,
         debug: bool = False,
+        finder: Finder = None,
+        sourceFiles: dict[str, SourceFiles] = None,
     ):
         self.markdown = markdown
         self.generatorBase = generatorBase
@@ -37,7 +124,8 @@ class GeneratorSnippets:
         self.page = page
         self.config = config
         self.debug = debug
-        self.finder = Finder(doxygen, debug)
+        self.finder = finder or Finder(doxygen, debug)
+        self.sourceFiles = sourceFiles or {}
 
         self.doxy_arguments = {
             "code": self.doxyCode,
@@ -61,52 +149,9 @@ class GeneratorSnippets:
             return self.markdown  # doxygen is inactive return unchanged markdown
 
         try:
-            matches = re.finditer(regexIncorrect, self.markdown, re.MULTILINE)
-            for match in reversed(list(matches)):
-                snippet = match.group()
-                project_name = match.group("project") or "<project_name>"
-
-                snippet_config = self.config.copy()
-                snippet_config.update(self.try_load_yaml(match.group("yaml"), project_name, snippet, self.config))
-
-                if self.is_doxy_inactive(snippet_config):
-                    continue
-
-                replacement = (
-                    self.incorrect_argument(project_name, "", snippet_config, snippet)
-                    if self.is_project_exist(project_name)
-                    else self.incorrect_project(project_name, snippet_config, snippet)
-                )
-                self.replace_markdown(match.start(), match.end(), replacement)
-
-            matches = re.finditer(regexShort, self.markdown, re.MULTILINE)
-            for match in reversed(list(matches)):
-                snippet = match.group()
-                argument = match.group("argument").lower()
-                project_name = match.group("project")
-
-                snippet_config = self.config.copy()
-                snippet_config.update(self.try_load_yaml(match.group("yaml"), project_name, snippet, self.config))
-
-                if self.is_doxy_inactive(snippet_config):
-                    continue
-
-                replaceStr = self.call_doxy_by_name(snippet, project_name, argument, snippet_config)
-                self.replace_markdown(match.start(), match.end(), replaceStr)
-
-            matches = re.finditer(regexLong, self.markdown, re.MULTILINE)
-            for match in reversed(list(matches)):
-                snippet = match.group()
-                argument = match.group("argument").lower()
-                project_name = match.group("project")
-                # log.debug(f"\nArgument: {argument}")
-
-                # config has been updated by yaml
-                snippet_config = self.config.copy()
-                snippet_config.update(self.try_load_yaml(match.group("yaml"), project_name, snippet, self.config))
-
-                replaceStr = self.call_doxy_by_name(snippet, project_name, argument, snippet_config)
-                self.replace_markdown(match.start(), match.end(), replaceStr)
+            snippets = self.collect_snippets()
+            replacements = self.resolve_snippets(snippets)
+            self.markdown = self.apply_snippets(snippets, replacements)
             return self.markdown
         except Exception as e:
             basename = pathlib.Path(__file__).name
@@ -114,9 +159,77 @@ class GeneratorSnippets:
             log.error(f"Error: {e}")
             return self.markdown
 
+    def collect_snippets(self) -> list["Snippet"]:
+        """! Find all doxy snippets on the page.
+        @details Incorrect snippets take precedence over short ones and short ones over long ones,
+        a match overlapping an already collected snippet is ignored.
+        @return: (list) Snippets ordered by their position in the markdown.
+        """
+        snippets: list[Snippet] = []
+        starts: list[int] = []
+        for kind, regex in snippetPatterns:
+            for match in regex.finditer(self.markdown):
+                snippet = Snippet(kind, match)
+                position = bisect.bisect_left(starts, snippet.start)
+                if position > 0 and snippets[position - 1].end > snippet.start:
+                    continue
+                if position < len(snippets) and snippets[position].start < snippet.end:
+                    continue
+                starts.insert(position, snippet.start)
+                snippets.insert(position, snippet)
+        return snippets
+
+    def resolve_snippets(self, snippets: list["Snippet"]) -> dict[tuple[str, str], str]:
+        """! Render every distinct snippet of the page once.
+        @details
+        @param snippets: (list) Snippets collected from the page.
+        @return: (dict) Replacement by snippet key, None for a snippet that stays unchanged.
+        """
+        replacements = {}
+        for snippet in snippets:
+            if snippet.key not in replacements:
+                replacements[snippet.key] = self.render_snippet(snippet)
+        return replacements
+
+    def render_snippet(self, snippet: "Snippet") -> str:
+        project_name = snippet.project or "<project_name>"
+
+        # config has been updated by yaml
+        snippet_config = self.config.copy()
+        snippet_config.update(self.try_load_yaml(snippet.yaml, project_name, snippet.code, self.config))
+
+        if self.is_doxy_inactive(snippet_config):
+            return None
+
+        if snippet.kind == SNIPPET_INCORRECT:
+            if self.is_project_exist(project_name):
+                return self.incorrect_argument(project_name, "", snippet_config, snippet.code)
+            return self.incorrect_project(project_name, snippet_config, snippet.code)
+
+        if not self.is_project_exist(project_name):
+            return self.incorrect_project(project_name, snippet_config, snippet.code)
+        return self.call_doxy_by_name(snippet.code, project_name, snippet.argument, snippet_config)
+
+    def apply_snippets(self, snippets: list["Snippet"], replacements: dict[tuple[str, str], str]) -> str:
+        out = []
+        last = 0
+        for snippet in snippets:
+            replacement = replacements[snippet.key]
+            if replacement is None:
+                continue
+            out.append(self.markdown[last : snippet.start])
+            out.append(replacement)
+            out.append("\n")
+            last = snippet.end
+        out.append(self.markdown[last:])
+        return "".join(out)
+
     def try_load_yaml(self, yaml_raw: str, project: str, snippet: str, config: dict) -> dict:
         try:
-            return yaml.safe_load(yaml_raw)
+            snippet_config = load_flat_yaml(yaml_raw)
+            if snippet_config is None:
+                snippet_config = yaml.load(yaml_raw, Loader=YamlLoader)
+            return snippet_config or {}
         except yaml.YAMLError:
             log.error(f"YAML error in {project} project on page {self.page.url}")
             self.doxyError(
@@ -160,9 +273,6 @@ class GeneratorSnippets:
             snippet,
         )
 
-    def replace_markdown(self, start: int, end: int, replacement: str):
-        self.markdown = self.markdown[:start] + replacement + "\n" + self.markdown[end:]
-
     def _setLinkPrefixNode(self, node: Node, linkPrefix: str):
         node.project.linkPrefix = linkPrefix
 
@@ -235,7 +345,7 @@ class GeneratorSnippets:
 
         if isinstance(node, Node):
             progCode = self.codeStrip(
-                node.programlisting,
+                self.codeSource(project, node),
                 node.code_language,
                 config.get("start", 1),
                 config.get("end", 0),
@@ -261,13 +371,19 @@ class GeneratorSnippets:
             snippet,
         )
 
-    def codeStrip(self, codeRaw, codeLanguage: str, start: int = 1, end: int = None):
-        lines = codeRaw.split("\n")
+    def codeSource(self, project: str, node: Node) -> SourceLines:
+        if project in self.sourceFiles:
+            source = self.sourceFiles[project].get(node.location)
+            if source is not None:
+                return source
+        return node.source
 
+    def codeStrip(self, source: SourceLines, codeLanguage: str, start: int = 1, end: int = None):
         if end and start > end:
             return False
 
-        out = "".join(line + "\n" for num, line in enumerate(lines) if num >= start and (num <= end or end == 0))
+        start = max(start, 1)
+        out = source.lines(start, end or 0)
         return f"```{codeLanguage} linenums='{start}'\n{out}```"
 
     def doxyFunction(self, snippet, project: str, config: dict):
@@ -0,0 +1,75 @@
+from typing import Dict, List, Tuple
+from xml.etree.ElementTree import Element as Element
+
+from mkdoxy.cache import Cache
+
+# Edge of the graph: (refid, name), refid is None for classes not documented by Doxygen (e.g. std::exception).
+Edge = Tuple[str, str]
+
+
+class InheritanceGraph:
+    """! Base and derived classes of all compounds of one project.
+    @details Adjacency lists keyed by refid, filled once while the compounds are loaded.
+    Bases and derived classes without a refid are kept as unresolved edges with their name.
+    """
+
+    def __init__(self, cache: Cache):
+        self.cache = cache
+        self._bases: Dict[str, List[Edge]] = {}
+        self._derived: Dict[str, List[Edge]] = {}
+
+    def add(self, refid: str, xml: Element):
+        """! Register the inheritance of a compound.
+        @param refid (str): Refid of the compound.
+        @param xml (Element): The compounddef element of the compound.
+        """
+        bases = [(ref.get("refid"), ref.text) for ref in xml.findall("basecompoundref")]
+        derived = [(ref.get("refid"), ref.text) for ref in xml.findall("derivedcompoundref")]
+        if bases:
+            self._bases[refid] = bases
+        if derived:
+            self._derived[refid] = derived
+
+    def _resolve(self, edges: List[Edge]) -> list:
+        return [name if ref is None else self.cache.get(ref) for ref, name in edges]
+
+    def has_bases(self, refid: str) -> bool:
+        return refid in self._bases
+
+    def has_derived(self, refid: str) -> bool:
+        return refid in self._derived
+
+    def bases(self, refid: str) -> list:
+        """! Direct base classes, Node for documented classes, name (str) for the others."""
+        return self._resolve(self._bases.get(refid, []))
+
+    def derived(self, refid: str) -> list:
+        """! Direct derived classes, Node for documented classes, name (str) for the others."""
+        return self._resolve(self._derived.get(refid, []))
+
+    def roots(self, refids: List[str]) -> Tuple[List[str], Dict[str, list]]:
+        """! Roots of the inheritance trees of classes.
+        @details Every class is visited once, in the order of a depth-first walk up the base classes.
+        @param refids ([str]): Refids of the classes.
+        @return ([str], dict): Refids of the documented roots (classes without bases) and for each
+        undocumented base class, the classes derived from it directly.
+        """
+        roots = {}
+        external: Dict[str, Dict[str, None]] = {}
+        visited = set()
+        stack = [(refid, None) for refid in reversed(refids)]
+        while stack:
+            refid, name = stack.pop()
+            if name is not None:
+                external.setdefault(name, {})[refid] = None
+                continue
+            if refid in visited:
+                continue
+            visited.add(refid)
+            bases = self._bases.get(refid)
+            if bases is None:
+                roots[refid] = None
+                continue
+            for base, baseName in reversed(bases):
+                stack.append((refid, baseName) if base is None else (base, None))
+        return list(roots), {name: [self.cache.get(refid) for refid in derived] for name, derived in external.items()}
@@ -1,3 +1,4 @@
+from abc import ABC, abstractmethod
 from typing import List
 
 
@@ -9,22 +10,88 @@ def escape(s: str) -> str:
     return ret.replace("|", "\\|")
 
 
+# Render steps of Md nodes, see MdNode.steps: str is written, EOL ends the line,
+# a node is rendered without indent and (node, indent) with indent
+EOL = None
+
+
+def indented(nodes: List["MdNode"], indent: str) -> list:
+    """Render steps of nodes with indent."""
+    return [(node, indent) for node in nodes] if indent else nodes
+
+
 class MdRenderer:
+    """Collects the rendered Markdown in a list of chunks, joined once when output is read."""
+
+    __slots__ = ("chunks", "eol_flag")
+
     def __init__(self):
-        self.output = ""
+        self.chunks: List[str] = []
         self.eol_flag = True
 
+    @property
+    def output(self) -> str:
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
+
     def write(self, s: str):
-        self.output += s
+        self.chunks.append(s)
         self.eol_flag = False
 
     def eol(self):
         if not self.eol_flag:
-            self.output += "\n"
+            self.chunks.append("\n")
             self.eol_flag = True
 
+    def render(self, nodes: List["MdNode"], indent: str = ""):
+        """Render nodes with an explicit stack, deeply nested documentation does not hit the recursion limit."""
+        chunks = self.chunks
+        eol_flag = self.eol_flag
+        stack = [iter(indented(nodes, indent))]
+        while stack:
+            for step in stack[-1]:
+                stepType = type(step)
+                if stepType is Text:
+                    # most nodes are text, written without building their steps
+                    if step.text:
+                        chunks.append(escape(step.text))
+                        eol_flag = False
+                elif stepType is str:
+                    chunks.append(step)
+                    eol_flag = False
+                elif step is EOL:
+                    if not eol_flag:
+                        chunks.append("\n")
+                        eol_flag = True
+                else:
+                    if stepType is tuple:
+                        step, indent = step
+                    else:
+                        indent = ""
+                    steps = step.steps(indent)
+                    if steps:
+                        stack.append(iter(steps))
+                        break
+            else:
+                stack.pop()
+        self.eol_flag = eol_flag
+
+
+class MdNode(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def steps(self, indent: str) -> list:
+        """Render steps of the node, in the order they are rendered."""
+
+    def render(self, f: MdRenderer, indent: str):
+        f.render([self], indent)
+
+
+class Md(MdNode):
+    __slots__ = ("children",)
 
-class Md:
     def __init__(self, children: List["Md"]):
         self.children = children
 
@@ -35,211 +102,225 @@ class Md:
         self.children.extend(child)
 
 
-class Text:
+class Text(MdNode):
+    __slots__ = ("text",)
+
     def __init__(self, text: str):
         self.text = text
 
-    def render(self, f: MdRenderer, indent: str):
-        if self.text:
-            f.write(escape(self.text))
+    def steps(self, indent: str) -> list:
+        return [escape(self.text)] if self.text else None
+
 
+class Br(MdNode):
+    __slots__ = ()
 
-class Br:
     def __init__(self):
         pass
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("\n\n")
+    def steps(self, indent: str) -> list:
+        return ["\n\n"]
 
 
 class MdHint(Md):
+    __slots__ = ("title", "typ")
+
     def __init__(self, children: List[Md], typ: str, title: str):
         Md.__init__(self, children)
         self.title = title
         self.typ = typ
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write(f"::: {self.typ} {self.title}" + "\n")
-        for child in self.children:
-            child.render(f, "")
-        f.write(":::\n")
+    def steps(self, indent: str) -> list:
+        return [f"::: {self.typ} {self.title}" + "\n", *self.children, ":::\n"]
 
 
 class MdBold(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("**")
-        for child in self.children:
-            child.render(f, "")
-        f.write("**")
+    def steps(self, indent: str) -> list:
+        return ["**", *self.children, "**"]
 
 
-class MdImage:
+class MdImage(MdNode):
+    __slots__ = ("url",)
+
     def __init__(self, url: str):
         self.url = url
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write(f"![Image]({self.url})")
+    def steps(self, indent: str) -> list:
+        return [f"![Image]({self.url})"]
 
 
-class Code:
+class Code(MdNode):
+    __slots__ = ("text",)
+
     def __init__(self, text: str):
         self.text = text
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write(f"`{self.text}`")
+    def steps(self, indent: str) -> list:
+        return [f"`{self.text}`"]
 
 
-class MdCodeBlock:
+class MdCodeBlock(MdNode):
+    __slots__ = ("lines",)
+
     def __init__(self, lines: List[str]):
         self.lines = lines
 
     def append(self, line: str):
         self.lines.append(line)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("```\n")
+    def steps(self, indent: str) -> list:
+        steps = ["```\n"]
         for line in self.lines:
-            f.write(line)
-            f.write("\n")
-        f.write("```\n")
+            steps.append(line)
+            steps.append("\n")
+        steps.append("```\n")
+        return steps
 
 
 class MdBlockQuote(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("\n")
+    def steps(self, indent: str) -> list:
+        steps = ["\n"]
         for child in self.children:
-            f.write("> ")
-            child.render(f, "")
-            f.write("\n")
+            steps.extend(("> ", child, "\n"))
+        return steps
 
 
 class MdItalic(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("_")
-        for child in self.children:
-            child.render(f, "")
-        f.write("_")
+    def steps(self, indent: str) -> list:
+        return ["_", *self.children, "_"]
 
 
 class MdParagraph(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        for child in self.children:
-            child.render(f, indent)
-        f.eol()
+    def steps(self, indent: str) -> list:
+        return [*indented(self.children, indent), EOL]
 
 
 class MdLink(Md):
+    __slots__ = ("url",)
+
     def __init__(self, children: List[Md], url: str):
         Md.__init__(self, children)
         self.url = url
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("[")
-        for child in self.children:
-            child.render(f, "")
-        f.write(f"]({self.url})")
+    def steps(self, indent: str) -> list:
+        return ["[", *self.children, f"]({self.url})"]
 
 
 class MdList(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.eol()
+    def steps(self, indent: str) -> list:
+        steps = [EOL]
         for child in self.children:
             if not isinstance(child, MdList):
-                f.write(f"{indent}* ")
-            child.render(f, f"{indent}  ")
+                steps.append(f"{indent}* ")
+            steps.append((child, f"{indent}  "))
+        return steps
+
 
+class MdLine(MdNode):
+    __slots__ = ()
 
-class MdLine:
     def __init__(self):
         pass
 
-    def render(self, f: MdRenderer, indent: str):
-        f.eol()
-        f.write("----------------------------------------")
-        f.eol()
+    def steps(self, indent: str) -> list:
+        return [EOL, "----------------------------------------", EOL]
 
 
 class MdHeader(Md):
+    __slots__ = ("level",)
+
     def __init__(self, level: int, children: List[Md]):
         Md.__init__(self, children)
         self.level = level
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("#" * self.level + " ")
-        for child in self.children:
-            child.render(f, f"{indent}")
-        f.write("\n")
-        f.eol()
+    def steps(self, indent: str) -> list:
+        return ["#" * self.level + " ", *indented(self.children, indent), "\n", EOL]
 
 
 class MdTableCell(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        for child in self.children:
-            child.render(f, indent)
+    def steps(self, indent: str) -> list:
+        return indented(self.children, indent)
 
 
 class MdTableRow(Md):
+    __slots__ = ()
+
     def __init__(self, children: List[Md]):
         Md.__init__(self, children)
 
-    def render(self, f: MdRenderer, indent: str):
-        f.eol()
-        f.write("|")
+    def steps(self, indent: str) -> list:
+        steps = [EOL, "|"]
         for child in self.children:
-            child.render(f, "")
-            f.write("|")
-        f.eol()
+            steps.extend((child, "|"))
+        steps.append(EOL)
+        return steps
 
 
 class MdTable(Md):
+    __slots__ = ()
+
     def __init__(self):
         Md.__init__(self, [])
 
-    def render(self, f: MdRenderer, indent: str):
+    def steps(self, indent: str) -> list:
         is_first = True
-        f.eol()
+        steps = [EOL]
         for child in self.children:
-            child.render(f, "")
+            steps.append(child)
             if is_first:
                 for _ in range(len(child.children)):
-                    f.write("|-----")
-                f.write("|")
+                    steps.append("|-----")
+                steps.append("|")
             is_first = False
-        f.write("\n\n")
+        steps.append("\n\n")
+        return steps
 
 
 class MdInlineEquation(Md):
+    __slots__ = ("equation",)
+
     def __init__(self, equation: str):
         self.equation = equation
 
-    def render(self, f: MdRenderer, indent: str):
-        if self.equation:
-            f.write(rf"\({self.equation}\)")
+    def steps(self, indent: str) -> list:
+        return [rf"\({self.equation}\)"] if self.equation else None
 
 
 class MdBlockEquation(Md):
+    __slots__ = ("equation",)
+
     def __init__(self, equation: str):
         self.equation = equation
 
-    def render(self, f: MdRenderer, indent: str):
-        f.write("\n")
-        f.write(rf"{indent}\[{self.equation}\]")
-        f.write("\n")
+    def steps(self, indent: str) -> list:
+        return ["\n", rf"{indent}\[{self.equation}\]", "\n"]
@@ -1,13 +1,25 @@
 import logging
 import os
 import re
+from functools import cached_property
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element as Element
 
-from mkdoxy.constants import OVERLOAD_OPERATORS, Kind, Visibility
+from mkdoxy.constants import (
+    CLASS_OR_STRUCT_KINDS,
+    COMPOUND_KINDS,
+    FILE_OR_DIR_KINDS,
+    LANGUAGE_KINDS,
+    OVERLOAD_OPERATORS,
+    OWN_PAGE_KINDS,
+    PARENT_KINDS,
+    Kind,
+    Visibility,
+)
 from mkdoxy.markdown import escape
 from mkdoxy.project import ProjectContext
 from mkdoxy.property import Property
+from mkdoxy.source import SourceLines
 from mkdoxy.utils import split_safe
 from mkdoxy.xml_parser import XmlParser
 
@@ -26,6 +38,8 @@ class Node:
         debug: bool = False,
     ):
         self._children: ["Node"] = []
+        self._child_index: dict = None
+        self._queries: dict = None
         self._cache = project.cache
         self._parser: XmlParser = parser
         self._parent = parent
@@ -35,6 +49,7 @@ class Node:
         if xml_file == "root":
             self._refid = "root"
             self._kind = Kind.from_str("root")
+            self._flags = self._kind.flag
             self._name = "root"
             self._xml = None
 
@@ -46,6 +61,7 @@ class Node:
             if self._xml is None:
                 raise Exception(f"File {xml_file} has no <compounddef>")
             self._kind = Kind.from_str(self._xml.get("kind"))
+            self._flags = self._kind.flag
             self._refid = self._xml.get("id")
             self._language = self._xml.get("language")
             if self._xml.find("compoundname").text is not None:
@@ -56,6 +72,7 @@ class Node:
             else:
                 self._name = self._refid
             self._cache.add(self._refid, self)
+            self.project.inheritance.add(self._refid, self._xml)
             self._static = False
 
             if self.debug:
@@ -67,6 +84,7 @@ class Node:
         else:
             self._xml = xml
             self._kind = Kind.from_str(self._xml.get("kind"))
+            self._flags = self._kind.flag
             self._language = parent.code_language
             self._refid = refid if refid is not None else self._xml.get("id")
             self._cache.add(self._refid, self)
@@ -88,15 +106,22 @@ class Node:
         self._initializer = Property.Initializer(self._xml, parser, self._kind)
         self._definition = Property.Definition(self._xml, parser, self._kind)
         self._programlisting = Property.Programlisting(self._xml, parser, self._kind)
+        self._source: SourceLines = None
 
     def __repr__(self):
         return f"Node: {self.name} refid: {self._refid}"
 
     def add_child(self, child: "Node"):
         self._children.append(child)
+        self._child_index = None
+
+    def remove_child(self, index: int) -> "Node":
+        self._child_index = None
+        return self._children.pop(index)
 
     def sort_children(self):
         self._children.sort(key=lambda x: x._name, reverse=False)
+        self._child_index = None
 
     def _check_for_children(self):
         for innergroup in self._xml.findall("innergroup"):
@@ -282,14 +307,34 @@ class Node:
     def has(self, visibility: str, kinds: [str], static: bool) -> bool:
         return len(self.query(visibility, kinds, static)) > 0
 
-    def query(self, visibility: str, kinds: [str], static: bool) -> ["Node"]:
-        visibility = Visibility(visibility)
-        kinds = list(map(lambda kind: Kind.from_str(kind), kinds))
-        return [
-            child
-            for child in self._children
-            if child._visibility == visibility and child._kind in kinds and child._static == static
-        ]
+    def query(self, visibility: str, kinds: [str], static: bool) -> ("Node",):
+        """Children with the visibility, one of the kinds and the static flag, in the order of the children.
+
+        The children are indexed by (visibility, kind, static) on the first query and the result of every query
+        is kept, templates ask for the same members in has() and query() and for many kind combinations.
+        The result is shared by all queries with the same arguments, so it is a tuple.
+        """
+        if self._child_index is None:
+            self._child_index = {}
+            for child in self._children:
+                self._child_index.setdefault((child._visibility, child._kind, child._static), []).append(child)
+            self._queries = {}
+
+        key = (visibility, tuple(kinds), static)
+        found = self._queries.get(key)
+        if found is None:
+            visibility = Visibility(visibility)
+            groups = [self._child_index.get((visibility, Kind.from_str(kind), static)) for kind in kinds]
+            groups = [group for group in groups if group]
+            if not groups:
+                found = ()
+            elif len(groups) == 1:
+                found = tuple(groups[0])
+            else:
+                members = {id(child) for group in groups for child in group}
+                found = tuple(child for child in self._children if id(child) in members)
+            self._queries[key] = found
+        return found
 
     @property
     def is_static(self) -> bool:
@@ -331,91 +376,96 @@ class Node:
     def parent(self) -> "Node":
         return self._parent
 
+    @property
+    def flags(self) -> int:
+        """! Bit of the kind of the node, test it against the kind masks of mkdoxy.constants."""
+        return self._flags
+
     @property
     def is_function(self) -> bool:
-        return self._kind.is_function()
+        return self._kind is Kind.FUNCTION
 
     @property
     def is_variable(self) -> bool:
-        return self._kind.is_variable()
+        return self._kind is Kind.VARIABLE
 
     @property
     def is_namespace(self) -> bool:
-        return self._kind.is_namespace()
+        return self._kind is Kind.NAMESPACE
 
     @property
     def is_class(self) -> bool:
-        return self._kind.is_class()
+        return self._kind is Kind.CLASS
 
     @property
     def is_struct(self) -> bool:
-        return self._kind.is_struct()
+        return self._kind is Kind.STRUCT
 
     @property
     def is_enum(self) -> bool:
-        return self._kind.is_enum()
+        return self._kind is Kind.ENUM
 
     @property
     def is_class_or_struct(self) -> bool:
-        return self._kind.is_class_or_struct()
+        return self._flags & CLASS_OR_STRUCT_KINDS != 0
 
     @property
     def is_interface(self) -> bool:
-        return self._kind.is_interface()
+        return self._kind is Kind.INTERFACE
 
     @property
     def is_typedef(self) -> bool:
-        return self._kind.is_typedef()
+        return self._kind is Kind.TYPEDEF
 
     @property
     def is_define(self) -> bool:
-        return self._kind.is_define()
+        return self._kind is Kind.DEFINE
 
     @property
     def is_union(self) -> bool:
-        return self._kind.is_union()
+        return self._kind is Kind.UNION
 
     @property
     def is_group(self) -> bool:
-        return self._kind.is_group()
+        return self._kind is Kind.GROUP
 
     @property
     def is_language(self) -> bool:
-        return self._kind.is_language()
+        return self._flags & LANGUAGE_KINDS != 0
 
     @property
     def is_root(self) -> bool:
-        return self._kind.is_root()
+        return self._kind is Kind.ROOT
 
     @property
     def is_parent(self) -> bool:
-        return self._kind.is_parent()
+        return self._flags & PARENT_KINDS != 0
 
     @property
     def is_friend(self) -> bool:
-        return self._kind.is_friend()
+        return self._kind is Kind.FRIEND
 
     @property
     def is_file(self) -> bool:
-        return self._kind.is_file()
+        return self._kind is Kind.FILE
 
     @property
     def is_dir(self) -> bool:
-        return self._kind.is_dir()
+        return self._kind is Kind.DIR
 
     @property
     def is_page(self) -> bool:
-        return self._kind.is_page()
+        return self._kind is Kind.PAGE
 
     @property
     def is_example(self) -> bool:
-        return self._kind.is_example()
+        return self._kind is Kind.EXAMPLE
 
     @property
     def name(self) -> str:
         return self._name
 
-    @property
+    @cached_property
     def name_params(self) -> str:
         name = self._name
         type = self._type.plain()
@@ -465,7 +515,7 @@ class Node:
                 break
         return total
 
-    @property
+    @cached_property
     def name_url_safe(self) -> str:
         name = self.name_tokens[-1]
         # Strip special characters that do not appear in anchors
@@ -492,10 +542,15 @@ class Node:
 
     @property
     def url(self) -> str:
-        if self.is_parent or self.is_group or self.is_file or self.is_dir or self.is_page:
-            return self.project.linkPrefix + self._refid + ".md"
+        return self.project.linkPrefix + self.url_path
+
+    @cached_property
+    def url_path(self) -> str:
+        """! URL of the node without the link prefix, which changes from page to page of the snippets."""
+        if self._flags & OWN_PAGE_KINDS:
+            return self._refid + ".md"
         else:
-            return f"{self._parent.url}#{self.anchor}"
+            return f"{self._parent.url_path}#{self.anchor}"
 
     @property
     def base_url(self) -> str:
@@ -524,7 +579,7 @@ class Node:
 
     @property
     def url_source(self) -> str:
-        if self.is_parent or self.is_group or self.is_file or self.is_dir:
+        if self._flags & COMPOUND_KINDS:
             return self.project.linkPrefix + self._refid + "_source.md"
         else:
             return self.project.linkPrefix + self._refid + ".md"
@@ -533,21 +588,23 @@ class Node:
     def filename(self) -> str:
         return self.project.linkPrefix + self._refid + ".md"
 
-    @property
+    # The root, names, parents and url_path are computed once per node, when the tree is complete: the values
+    # of a node build on the already computed values of its parent instead of walking up the parents again.
+    @cached_property
     def root(self) -> "Node":
-        return self if self._kind == Kind.ROOT else self._parent.root
+        return self if self._kind is Kind.ROOT else self._parent.root
 
-    @property
+    @cached_property
     def name_tokens(self) -> [str]:
-        if self.is_dir or self.is_file:
+        if self._flags & FILE_OR_DIR_KINDS:
             return self._name.split("/")
         return split_safe(self._name, "::")
 
-    @property
+    @cached_property
     def name_short(self) -> str:
         return escape(self.name_tokens[-1])
 
-    @property
+    @cached_property
     def name_long(self) -> str:
         try:
             if self._parent.is_parent:
@@ -558,7 +615,7 @@ class Node:
             print(e)
             raise e
 
-    @property
+    @cached_property
     def name_full_unescaped(self) -> str:
         if self._parent is not None and not self._parent.is_root and self._parent.is_parent:
             return f"{self._parent.name_full_unescaped}::{self.name_tokens[-1]}"
@@ -595,13 +652,12 @@ class Node:
         total = self.overload_total
         return f"[{str(self.overload_num)}/{str(total)}]" if total > 1 else ""
 
-    @property
-    def parents(self) -> ["Node"]:
-        ret = []
-        if self._parent is not None and (self._parent.is_language or self._parent.is_dir):
-            ret.extend(self.parent.parents)
-        ret.append(self)
-        return ret
+    @cached_property
+    def parents(self) -> ("Node",):
+        """! Breadcrumb of the node: its language or directory ancestors and the node itself."""
+        if self._parent is not None and self._parent._flags & (LANGUAGE_KINDS | Kind.DIR.flag):
+            return (*self._parent.parents, self)
+        return (self,)
 
     @property
     def suffix(self) -> str:
@@ -636,7 +692,9 @@ class Node:
     def code_language(self) -> str:
         return self._language
 
-    @property
+    # Declarations of members are shown on several pages (class, file, indexes, snippets) and in both member
+    # tables and member details, they are built once per node.
+    @cached_property
     def codeblock(self) -> str:
         code = []
         if self.is_function or self.is_friend:
@@ -657,12 +715,7 @@ class Node:
 
             if self._params.has():
                 code.append(typ + self.name_full_unescaped + " (")
-                params = self._params.array(plain=True)
-                for i, param in enumerate(params):
-                    if i + 1 >= len(params):
-                        code.append(f"    {param}")
-                    else:
-                        code.append(f"    {param},")
+                code.append(",\n".join(f"    {param}" for param in self._params.array(plain=True)))
                 code.append(f") {self._specifiers.parsed()}")
             else:
                 code.append(typ + self.name_full_unescaped + " () " + self._specifiers.parsed())
@@ -679,11 +732,7 @@ class Node:
                         p += f" {self._parser.paras_as_str(initializer, plain=True)}"
                     values.append(p)
 
-                for i, value in enumerate(values):
-                    if i + 1 >= len(values):
-                        code.append(f"    {value}")
-                    else:
-                        code.append(f"    {value},")
+                code.append(",\n".join(f"    {value}" for value in values))
                 code.append("};")
             else:
                 code.append(f"enum {self.name_full_unescaped};")
@@ -691,12 +740,7 @@ class Node:
         elif self.is_define:
             if self._params.has():
                 code.append(f"#define {self.name_full_unescaped} (")
-                params = self._params.array(plain=True)
-                for i, param in enumerate(params):
-                    if i + 1 >= len(params):
-                        code.append(f"    {param}")
-                    else:
-                        code.append(f"    {param},")
+                code.append(",\n".join(f"    {param}" for param in self._params.array(plain=True)))
                 code.append(f") {self._initializer.plain()}")
             else:
                 code.append(f"#define {self.name_full_unescaped} {self._initializer.plain()}")
@@ -707,33 +751,26 @@ class Node:
 
     @property
     def has_base_classes(self) -> bool:
-        return len(self._xml.findall("basecompoundref")) > 0
+        return self.project.inheritance.has_bases(self._refid)
 
     @property
     def has_derived_classes(self) -> bool:
-        return len(self._xml.findall("derivedcompoundref")) > 0
+        return self.project.inheritance.has_derived(self._refid)
 
     @property
     def base_classes(self) -> ["Node"]:
-        ret = []
-        for basecompoundref in self._xml.findall("basecompoundref"):
-            refid = basecompoundref.get("refid")
-            if refid is None:
-                ret.append(basecompoundref.text)
-            else:
-                ret.append(self._cache.get(refid))
-        return ret
+        return self.project.inheritance.bases(self._refid)
+
+    @property
+    def references(self) -> [str]:
+        """! Refids of all compounds and members referenced in the XML of this node."""
+        if self._xml is None:
+            return []
+        return [element.get("refid") for element in self._xml.iter() if element.get("refid") is not None]
 
     @property
     def derived_classes(self) -> ["Node"]:
-        ret = []
-        for derivedcompoundref in self._xml.findall("derivedcompoundref"):
-            refid = derivedcompoundref.get("refid")
-            if refid is None:
-                ret.append(derivedcompoundref.text)
-            else:
-                ret.append(self._cache.get(refid))
-        return ret
+        return self.project.inheritance.derived(self._refid)
 
     @property
     def has_details(self) -> bool:
@@ -844,6 +881,13 @@ class Node:
     def programlisting(self) -> str:
         return self._programlisting.md()
 
+    @property
+    def source(self) -> SourceLines:
+        """! Program listing of the file as a line-indexed buffer, built once per node."""
+        if self._source is None:
+            self._source = SourceLines(self._programlisting.code())
+        return self._source
+
     @property
     def is_resolved(self) -> bool:
         return True
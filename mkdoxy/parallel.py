@@ -0,0 +1,104 @@
+"""@package mkdoxy.parallel
+Fork-based worker pool used to render pages concurrently.
+
+Workers are forked after the task is installed, so they inherit the already loaded Doxygen model
+(copy-on-write) instead of receiving a pickled copy. Only job indices, rendered results and log records
+cross the process boundary.
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List
+
+from mkdoxy.renderStats import RenderStats
+
+log: logging.Logger = logging.getLogger("mkdocs")
+
+_task: Callable[[int], Any] = None
+_stats: RenderStats = None
+_records: List[logging.LogRecord] = []
+
+
+class _RecordCollector(logging.Handler):
+    """! Collects log records inside a worker, so the parent process can replay them."""
+
+    def emit(self, record: logging.LogRecord):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        _records.append(record)
+
+
+def _init_worker():
+    log.handlers = [_RecordCollector()]
+    log.propagate = False
+
+
+def _run(index: int):
+    _records.clear()
+    if _stats is None:
+        return _task(index), None, list(_records)
+    result, samples = _stats.collect(lambda: _task(index))
+    return result, samples, list(_records)
+
+
+def fork_available() -> bool:
+    """! Checks if worker processes can be forked safely on this platform.
+    @details Only on Linux: macOS offers fork, but its system libraries are not fork-safe.
+    @return: (bool) True on Linux with the 'fork' start method available.
+    """
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def worker_count(workers: int) -> int:
+    """! Resolves the configured number of workers.
+    @details
+    @param workers: (int) Configured number of workers, 0 means one per CPU.
+    @return: (int) Number of workers to use.
+    """
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def map_parallel(task: Callable[[int], Any], count: int, workers: int = 0, stats: RenderStats = None) -> list:
+    """! Run task(0) ... task(count - 1) in forked worker processes.
+    @details Results are returned in job order. Log records emitted by the workers are replayed
+    in the parent process, so MkDocs still counts warnings in strict mode.
+    Likewise, render stats recorded by the workers are merged into stats of the parent process.
+    Falls back to serial execution when fork is not available (see fork_available) or only one worker is needed.
+    The caller must not fork from a multi-threaded process, e.g. `mkdocs serve`.
+    @param task: (Callable) Job function taking the job index, its result must be picklable.
+    @param count: (int) Number of jobs.
+    @param workers: (int) Number of worker processes, 0 means one per CPU.
+    @param stats: (RenderStats) Render stats the tasks record to (default: None).
+    @return: (list) Results of all jobs in job order.
+    """
+    global _task, _stats
+    workers = min(worker_count(workers), count)
+    if workers <= 1 or not fork_available():
+        return [task(index) for index in range(count)]
+
+    _task = task
+    _stats = stats
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+        ) as pool:
+            results = []
+            chunksize = max(1, count // (workers * 4))
+            for result, samples, records in pool.map(_run, range(count), chunksize=chunksize):
+                for record in records:
+                    log.handle(record)
+                if samples is not None:
+                    stats.merge(samples)
+                results.append(result)
+            return results
+    finally:
+        _task = None
+        _stats = None
@@ -10,14 +10,19 @@ from pathlib import Path, PurePath
 from mkdocs import exceptions
 from mkdocs.config import Config, base, config_options
 from mkdocs.plugins import BasePlugin
-from mkdocs.structure import files, pages
+from mkdocs.structure import files, nav, pages
+from mkdocs.utils import meta
 
 from mkdoxy.cache import Cache
 from mkdoxy.doxygen import Doxygen
 from mkdoxy.doxyrun import DoxygenRun
+from mkdoxy.finder import Finder
 from mkdoxy.generatorAuto import GeneratorAuto
 from mkdoxy.generatorBase import GeneratorBase
 from mkdoxy.generatorSnippets import GeneratorSnippets
+from mkdoxy.parallel import map_parallel
+from mkdoxy.renderStats import RenderStats
+from mkdoxy.source import SourceFiles
 from mkdoxy.xml_parser import XmlParser
 
 log: logging.Logger = logging.getLogger("mkdocs")
@@ -35,6 +40,12 @@ class MkDoxy(BasePlugin):
         ("ignore-errors", config_options.Type(bool, default=False)),
         ("save-api", config_options.Type(str, default="")),
         ("enabled", config_options.Type(bool, default=True)),
+        ("parallel-snippets", config_options.Type(bool, default=False)),
+        ("parallel-full-doc", config_options.Type(bool, default=False)),
+        ("workers", config_options.Type(int, default=0)),
+        ("incremental", config_options.Type(bool, default=False)),
+        ("render-stats", config_options.Type(bool, default=False)),
+        ("render-stats-file", config_options.Type(str, default="")),
         (
             "doxygen-bin-path",
             config_options.Type(str, default="doxygen", required=False),
@@ -51,8 +62,29 @@ class MkDoxy(BasePlugin):
         ("doxy-cfg", config_options.Type(dict, default={}, required=False)),
         ("doxy-cfg-file", config_options.Type(str, default="", required=False)),
         ("template-dir", config_options.Type(str, default="", required=False)),
+        ("source-excerpts", config_options.Type(bool, default=False, required=False)),
     )
 
+    # set by on_startup, forking worker processes from the threaded `mkdocs serve` process is not safe
+    serving: bool = False
+
+    def on_startup(self, *, command: str, dirty: bool):
+        """! Remember the MkDocs command of this run.
+        @details
+
+        @param command: (str) The MkDocs command: build, gh-deploy or serve.
+        @param dirty: (bool) True for dirty builds.
+        """
+        self.serving = command == "serve"
+
+    def parallel(self, option: str) -> bool:
+        """! Checks if a parallel rendering option is enabled and usable in this run.
+        @details Under `mkdocs serve` the pages are rendered serially.
+        @param option: (str) parallel-snippets or parallel-full-doc.
+        @return: (bool) True if pages are rendered in worker processes.
+        """
+        return self.config[option] and not self.serving
+
     def is_enabled(self) -> bool:
         """! Checks if the plugin is enabled
         @details
@@ -92,8 +124,16 @@ class MkDoxy(BasePlugin):
 
         self.doxygen = {}
         self.generatorBase = {}
+        self.renderedSnippets: dict[str, tuple[str, str]] = {}
+        self.fullDocSrcUris: set[str] = set()
+        self.changedFiles: set[str] = set()  # src_uri of generated pages rewritten in this build
+        self.sourceFiles: dict[str, SourceFiles] = {}
         self.projects_config: dict[str, dict[str, any]] = self.config["projects"]
         self.debug = self.config.get("debug", False)
+        self.finder = Finder(self.doxygen, self.debug)
+        self.renderStats: RenderStats = None
+        if self.config["render-stats"] or self.config["render-stats-file"]:
+            self.renderStats = RenderStats()
 
         # generate automatic documentation and append files in the list of files to be processed by mkdocs
         self.defaultTemplateConfig: dict = {
@@ -101,6 +141,15 @@ class MkDoxy(BasePlugin):
         }
 
         log.info(f"Start plugin {pluginName}")
+        if self.serving and (self.config["parallel-snippets"] or self.config["parallel-full-doc"]):
+            log.info(f"{pluginName}: parallel rendering is disabled in mkdocs serve, pages are rendered serially")
+        if self.config["incremental"] and not self.config.get("save-api"):
+            log.warning(f"{pluginName}: 'incremental' needs 'save-api', pages are kept between builds only there")
+
+        # compiled templates are shared by all projects, a persistent API directory keeps them for later builds
+        templatesCacheDir = ""
+        if self.config.get("save-api"):
+            templatesCacheDir = tempDir("", self.config.get("save-api"), ".templates")
 
         for project_name, project_data in self.projects_config.items():
             log.info(f"-> Start project '{project_name}'")
@@ -137,11 +186,17 @@ class MkDoxy(BasePlugin):
             if self.debug:
                 self.doxygen[project_name].printStructure()
 
+            # Read code excerpts from the original sources instead of the Doxygen program listing
+            if project_data.get("source-excerpts", False):
+                self.sourceFiles[project_name] = SourceFiles(project_data.get("src-dirs"))
+
             # Prepare generator for future use (GeneratorAuto, SnippetGenerator)
             self.generatorBase[project_name] = GeneratorBase(
                 project_data.get("template-dir", ""),
                 ignore_errors=self.config["ignore-errors"],
                 debug=self.debug,
+                cacheDir=templatesCacheDir,
+                stats=self.renderStats,
             )
 
             if self.config["full-doc"] and project_data.get("full-doc", True):
@@ -152,6 +207,9 @@ class MkDoxy(BasePlugin):
                     apiPath=project_data.get("api-path", project_name),
                     doxygen=self.doxygen[project_name],
                     useDirectoryUrls=config["use_directory_urls"],
+                    parallel=self.parallel("parallel-full-doc"),
+                    workers=self.config["workers"],
+                    incremental=self.config["incremental"],
                 )
 
                 project_config = self.defaultTemplateConfig.copy()
@@ -162,8 +220,47 @@ class MkDoxy(BasePlugin):
 
                 for file in generatorAuto.fullDocFiles:
                     files.append(file)
+                    self.fullDocSrcUris.add(file.src_uri)
+                self.changedFiles.update(generatorAuto.changedFiles)
+                log.info(f"  -> {len(generatorAuto.changedFiles)} of {len(generatorAuto.fullDocFiles)} pages changed")
         return files
 
+    def on_nav(self, nav: nav.Navigation, config: base.Config, files: files.Files) -> nav.Navigation:
+        """! Pre-render snippets of all pages in a worker pool (opt-in).
+        @details All page sources are known at this point, so every page with a snippet is rendered
+        up front and on_page_markdown only substitutes the result.
+
+        @param nav: (Navigation) The MkDocs navigation.
+        @param config: (Config) The global configuration object.
+        @param files: (Files) The files gathered by MkDocs.
+        @return: (Navigation) The MkDocs navigation.
+        """
+        if not self.is_enabled() or not self.parallel("parallel-snippets"):
+            return nav
+
+        sources = []
+        for file in files.documentation_pages():
+            if file.page is None or file.src_uri in self.fullDocSrcUris:
+                continue
+            with open(file.abs_src_path, encoding="utf-8-sig", errors="strict") as f:
+                markdown, page_meta = meta.get_data(f.read())
+            if "::: doxy" in markdown:
+                sources.append((file.page, markdown, page_meta))
+
+        def render(index: int) -> str:
+            page, markdown, page_meta = sources[index]
+            return self.generateSnippets(markdown, page, page_meta, config)
+
+        # build the lookup tables before forking, so the workers share them
+        for project in self.doxygen:
+            self.finder.index(project)
+
+        log.info(f"{pluginName}: pre-rendering snippets of {len(sources)} pages")
+        rendered = map_parallel(render, len(sources), self.config["workers"], self.renderStats)
+        for (page, markdown, _), output in zip(sources, rendered):
+            self.renderedSnippets[page.file.src_uri] = (markdown, output)
+        return nav
+
     def on_page_markdown(
         self,
         markdown: str,
@@ -183,9 +280,26 @@ class MkDoxy(BasePlugin):
         if not self.is_enabled():
             return markdown
 
+        # use the pre-rendered page unless another plugin changed its markdown in the meantime
+        source, output = self.renderedSnippets.get(page.file.src_uri, (None, None))
+        if source == markdown:
+            return output
+
+        return self.generateSnippets(markdown, page, page.meta, config)
+
+    def generateSnippets(self, markdown: str, page: pages.Page, page_meta: dict, config: base.Config) -> str:
+        """! Replace snippets of one page with the generated documentation.
+        @details
+
+        @param markdown (str): The markdown.
+        @param page (Page): The MkDocs page.
+        @param page_meta (dict): The page meta (front matter).
+        @param config (Config): The MkDocs config.
+        @return: (str) The markdown.
+        """
         # update default template config with page meta
         page_config = self.defaultTemplateConfig.copy()
-        page_config.update(page.meta)
+        page_config.update(page_meta)
 
         generatorSnippets = GeneratorSnippets(
             markdown=markdown,
@@ -196,10 +310,34 @@ class MkDoxy(BasePlugin):
             page=page,
             config=page_config,
             debug=self.debug,
+            finder=self.finder,
+            sourceFiles=self.sourceFiles,
         )
 
         return generatorSnippets.generate()
 
+    def on_post_build(self, config: base.Config):
+        """! Release the mapped source files and report the render stats of the build (opt-in).
+        @details
+
+        @param config (Config): The MkDocs config.
+        """
+        if not self.is_enabled():
+            return
+
+        # mappings would pile up with every rebuild of `mkdocs serve` and keep the sources locked on Windows
+        for sourceFiles in self.sourceFiles.values():
+            sourceFiles.close()
+        self.sourceFiles.clear()
+
+        if self.renderStats is None:
+            return
+
+        log.info(f"{pluginName}: render stats\n{self.renderStats.table()}")
+        if self.config["render-stats-file"]:
+            self.renderStats.dump(self.config["render-stats-file"])
+            log.info(f"{pluginName}: render stats saved to {self.config['render-stats-file']}")
+
 
 # def on_serve(self, server):
 #     return server
@@ -1,7 +1,9 @@
 from mkdoxy.cache import Cache
+from mkdoxy.inheritance import InheritanceGraph
 
 
 class ProjectContext:
     def __init__(self, cache: Cache) -> None:
         self.cache = cache
         self.linkPrefix: str = ""
+        self.inheritance = InheritanceGraph(cache)
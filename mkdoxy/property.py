@@ -336,13 +336,20 @@ class Property:
             self.xml = xml
             self.parser = parser
             self.kind = kind
+            self._code = None
 
         def md(self, plain: bool = False) -> str:
-            programlisting = self.xml.find("programlisting")
-            if programlisting is None:
+            if not self.has():
                 return ""
 
-            return self.parser.programlisting_as_str(programlisting)
+            return self.parser.code_block_as_str(self.code())
+
+        def code(self) -> str:
+            """Plain code of the listing, extracted once (source pages and code snippets share it)."""
+            if self._code is None:
+                programlisting = self.xml.find("programlisting")
+                self._code = self.parser.programlisting_code(programlisting) if programlisting is not None else ""
+            return self._code
 
         def has(self) -> bool:
             return self.xml.find("programlisting") is not None
@@ -0,0 +1,126 @@
+import json
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from jinja2 import Template
+
+log: logging.Logger = logging.getLogger("mkdocs")
+
+# (section, name, node kind): ("template", template name, kind) for GeneratorBase.render,
+# ("page", render function, kind) for GeneratorAuto.save
+Key = Tuple[str, str, str]
+# (seconds, output bytes) of one render
+Sample = Tuple[float, int]
+
+
+def nodeKind(data: Any) -> str:
+    """! Kind of the node rendered with data (template data or render function arguments), "-" if there is none."""
+    node = data.get("node") if isinstance(data, dict) else data
+    kind = getattr(node, "kind", None)
+    return getattr(kind, "value", "-")
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """! Nearest-rank percentile of values."""
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+class RenderStats:
+    """! Count, time and output size of rendered templates and saved pages.
+    @details Times of a template include the templates rendered inside of it,
+    times of a page include rendering the page when it is streamed to disk.
+    """
+
+    def __init__(self):
+        self.samples: Dict[Key, List[Sample]] = {}
+
+    def record(self, key: Key, seconds: float, size: int):
+        self.samples.setdefault(key, []).append((seconds, size))
+
+    def timed(self, key: Key, chunks: Iterable[str]) -> Iterator[str]:
+        """! Pass chunks through and record the time spent producing them, not consuming them."""
+        iterator = iter(chunks)
+        seconds = 0.0
+        size = 0
+        while True:
+            start = time.perf_counter()
+            chunk = next(iterator, None)
+            seconds += time.perf_counter() - start
+            if chunk is None:
+                break
+            size += len(chunk.encode("utf-8"))
+            yield chunk
+        self.record(key, seconds, size)
+
+    def collect(self, task: Callable[[], Any]) -> Tuple[Any, Dict[Key, List[Sample]]]:
+        """! Run a job of a worker process with its own samples.
+        @return (Any, dict): Result of the job and its samples, to be merged in the parent process.
+        """
+        samples = self.samples
+        self.samples = {}
+        try:
+            return task(), self.samples
+        finally:
+            self.samples = samples
+
+    def merge(self, samples: Dict[Key, List[Sample]]):
+        for key, values in samples.items():
+            self.samples.setdefault(key, []).extend(values)
+
+    def rows(self) -> List[dict]:
+        """! Summary per key, the most expensive first."""
+        rows = []
+        for (section, name, kind), values in self.samples.items():
+            times = [seconds for seconds, _ in values]
+            rows.append(
+                {
+                    "section": section,
+                    "name": name,
+                    "kind": kind,
+                    "count": len(values),
+                    "total": sum(times),
+                    "p95": percentile(times, 95),
+                    "bytes": sum(size for _, size in values),
+                }
+            )
+        rows.sort(key=lambda row: (row["section"], -row["total"]))
+        return rows
+
+    def table(self) -> str:
+        lines = [f"{'section':<10}{'name':<20}{'kind':<12}{'count':>8}{'total [s]':>12}{'p95 [ms]':>12}{'bytes':>14}"]
+        for row in self.rows():
+            lines.append(
+                f"{row['section']:<10}{row['name']:<20}{row['kind']:<12}{row['count']:>8}"
+                f"{row['total']:>12.3f}{row['p95'] * 1000:>12.2f}{row['bytes']:>14}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.rows(), file, indent=2)
+
+
+class TimedTemplate(Template):
+    """! Template rendered inside of another template (memTab, memDef, ...), records each of its renders.
+    @details It shares the compiled code of the wrapped template and is a Template itself, so it can also be
+    included, imported or used through any other Template attribute. Only render() is recorded.
+    """
+
+    def __new__(cls, template: Template, name: str, stats: RenderStats):
+        timed = object.__new__(cls)
+        timed.__dict__.update(template.__dict__)
+        timed.statsName = name
+        timed.stats = stats
+        return timed
+
+    def render(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        rendered = super().render(*args, **kwargs)
+        kind = nodeKind(args[0] if args else kwargs)
+        self.stats.record(
+            ("template", self.statsName, kind), time.perf_counter() - start, len(rendered.encode("utf-8"))
+        )
+        return rendered
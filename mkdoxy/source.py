@@ -0,0 +1,119 @@
+"""@package mkdoxy.source
+Line-indexed source code buffers used for code excerpts.
+"""
+
+import logging
+import mmap
+import os
+
+log: logging.Logger = logging.getLogger("mkdocs")
+
+
+class SourceLines:
+    """! Source text with an index of line offsets.
+    @details Slicing lines N..M costs O(M - N), the text is neither split nor copied as a whole.
+    Line numbers are 1-based like in the source file.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.offsets = self._index("\n")
+
+    def _index(self, newline) -> list[int]:
+        offsets = [0]
+        position = self.text.find(newline)
+        while position != -1:
+            offsets.append(position + 1)
+            position = self.text.find(newline, position + 1)
+        if offsets[-1] == len(self.text):
+            offsets.pop()  # no line after the trailing newline
+        return offsets
+
+    def _decode(self, chunk) -> str:
+        return chunk
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def lines(self, start: int = 1, end: int = 0) -> str:
+        """! Get lines from start to end (both included).
+        @details
+        @param start: (int) First line, 1-based.
+        @param end: (int) Last line, 0 means the last line of the source.
+        @return: (str) The lines, each one terminated by a newline.
+        """
+        start = max(start, 1)
+        if end <= 0 or end > len(self):
+            end = len(self)
+        if start > end:
+            return ""
+        stop = self.offsets[end] if end < len(self) else len(self.text)
+        out = self._decode(self.text[self.offsets[start - 1] : stop])
+        return out if out.endswith("\n") else out + "\n"
+
+
+class MappedSource(SourceLines):
+    """! Original source file mapped into memory.
+    @details Only the line index is kept in Python objects, excerpts are decoded from the mapping on demand.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self.text = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file can not be mapped
+                self.text = b""
+        self.offsets = self._index(b"\n")
+
+    def _decode(self, chunk) -> str:
+        return chunk.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+    def close(self):
+        """! Release the mapping, the file is no longer locked (Windows) afterwards."""
+        if isinstance(self.text, mmap.mmap):
+            self.text.close()
+
+
+class SourceFiles:
+    """! Original source files of one project, each one mapped on first use."""
+
+    def __init__(self, srcDirs: str, baseDir: str = None):
+        self.srcDirs = srcDirs.split(" ") if srcDirs else []
+        self.baseDir = baseDir or os.getcwd()
+        self.files: dict[str, MappedSource] = {}
+
+    def resolve(self, path: str) -> str:
+        """! Find the source file of a Doxygen location.
+        @details Doxygen strips the working directory from the paths, so a relative location is looked up
+        in the working directory first and then in the source directories of the project.
+        @param path: (str) File path from the Doxygen location.
+        @return: (str) Path to the existing file or None.
+        """
+        if os.path.isabs(path):
+            candidates = [path]
+        else:
+            candidates = [os.path.join(self.baseDir, path)]
+            candidates.extend(os.path.join(self.baseDir, srcDir, path) for srcDir in self.srcDirs)
+        return next((candidate for candidate in candidates if os.path.isfile(candidate)), None)
+
+    def get(self, path: str) -> MappedSource:
+        """! Get the mapped source file of a Doxygen location.
+        @details
+        @param path: (str) File path from the Doxygen location.
+        @return: (MappedSource) Mapped source file or None if the file does not exist.
+        """
+        if path not in self.files:
+            resolved = self.resolve(path) if path else None
+            if resolved is None:
+                # info, not warning: the fallback is expected and parallel workers log it each on their own
+                log.info(f"  -> Source file '{path}' not found, using Doxygen program listing")
+            self.files[path] = MappedSource(resolved) if resolved else None
+        return self.files[path]
+
+    def close(self):
+        """! Close all mapped source files, they are mapped again on the next use."""
+        for source in self.files.values():
+            if source is not None:
+                source.close()
+        self.files.clear()
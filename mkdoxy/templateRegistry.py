@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template
+
+import mkdoxy
+from mkdoxy.filters import use_code_language
+from mkdoxy.utils import parseTemplateFile
+
+log: logging.Logger = logging.getLogger("mkdocs")
+
+ENDING = (".jinja2", ".j2", ".jinja")
+
+# top level indent filter of a template, see GeneratorBase.stream
+INDENT_FILTER = re.compile(
+    r"(?P<head>\s*)\{% filter indent\(config\.get\('indent_level', 0\), True\) %\}"
+    r"(?P<body>.*)\{% endfilter %\}(?P<tail>(?:(?!\{[{%#]).)*)",
+    re.DOTALL,
+)
+
+
+def sourceHash(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+class TemplateRegistry:
+    """! Compiled templates shared by all generators of the process.
+    @details Templates are compiled under the hash of their source, so every distinct source is parsed and compiled
+    once, no matter how many projects or builds (`mkdocs serve` reloads) use it.
+    Loaded template files are kept by their name, a changed file replaces its old entry.
+    With a cache directory, the compiled code is also kept on disk for later processes.
+    """
+
+    def __init__(self):
+        self.environment = Environment(loader=FunctionLoader(self._source), auto_reload=False)
+        self.environment.filters["use_code_language"] = use_code_language
+        self.sources: Dict[str, str] = {}  # template code by its hash, only while it is compiled
+        self.loaded: Dict[str, Tuple[str, Tuple[Template, dict, Template]]] = {}  # source hash and template by name
+        self.defaultSources: Dict[str, str] = None
+
+    def _source(self, key: str):
+        source = self.sources.get(key)
+        if source is None:
+            return None
+        return source, None, lambda: True
+
+    def useCacheDir(self, directory: str):
+        """! Keep compiled templates in a directory (Jinja2 bytecode cache), "" keeps them in memory only."""
+        if not directory:
+            self.environment.bytecode_cache = None
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.environment.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    def compile(self, code: str) -> Template:
+        # the environment keeps the compiled template, the code is not needed afterwards
+        key = sourceHash(code)
+        self.sources[key] = code
+        try:
+            return self.environment.get_template(key)
+        finally:
+            del self.sources[key]
+
+    def load(self, name: str, source: str) -> Tuple[Template, dict, Template]:
+        """! Template of a template file.
+        @param name (str): Name of the template file, unique among all template directories.
+        @param source (str): Content of the template file, with the optional YAML header.
+        @return (Template, dict, Template): The template, its metadata from the header and the template
+        without its top level indent filter (None if it has none).
+        """
+        key = sourceHash(source)
+        loaded = self.loaded.get(name)
+        if loaded is None or loaded[0] != key:
+            fileTemplate, metaData = parseTemplateFile(source)
+            match = INDENT_FILTER.fullmatch(fileTemplate)
+            streamTemplate = self.compile(match["head"] + match["body"] + match["tail"]) if match else None
+            loaded = key, (self.compile(fileTemplate), metaData, streamTemplate)
+            self.loaded[name] = loaded
+        return loaded[1]
+
+    @staticmethod
+    def readDir(path: str) -> Dict[str, str]:
+        """! Sources of all template files in a directory by template name."""
+        sources = {}
+        for fileName in os.listdir(path):
+            filePath = os.path.join(path, fileName)
+
+            # accept any case of the file ending
+            if fileName.lower().endswith(ENDING):
+                with open(filePath, "r") as file:
+                    sources[os.path.splitext(fileName)[0]] = file.read()
+            else:
+                log.error(
+                    f"Trying to load unsupported file '{filePath}'. Supported file ends with {ENDING}."
+                    f"Look at documentation: https://mkdoxy.kubaandrysek.cz/usage/#custom-jinja-templates."
+                )
+        return sources
+
+    def defaults(self) -> Dict[str, str]:
+        """! Sources of the built-in templates, read once per process."""
+        if self.defaultSources is None:
+            # code from https://github.com/daizutabi/mkapi/blob/master/mkapi/core/renderer.py#L29-L38
+            self.defaultSources = self.readDir(os.path.join(os.path.dirname(mkdoxy.__file__), "templates"))
+        return self.defaultSources
+
+
+templateRegistry = TemplateRegistry()
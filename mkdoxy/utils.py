@@ -1,9 +1,12 @@
 import logging
 import re
+from functools import lru_cache
 
 import yaml
 from mkdocs.config import Config
 
+from mkdoxy.constants import CONTAINER_KINDS
+
 log: logging.Logger = logging.getLogger("mkdocs")
 
 
@@ -28,44 +31,38 @@ def lookahead(iterable):
     yield last, False
 
 
-def contains(a, pos, b):
-    ai = pos
-    bi = 0
-    if len(b) > len(a) - ai:
-        return False
-    while bi < len(b):
-        if a[ai] != b[bi]:
-            return False
-        ai += 1
-        bi += 1
-    return True
+# characters of template arguments, parameters and array sizes, where split_safe does not split
+BRACKETS = re.compile(r"[<\[{(>\]})]")
+
+
+@lru_cache(maxsize=None)
+def _split_scanner(delim: str) -> re.Pattern:
+    """Scanner of brackets (opening in group 1, closing in group 2) and delimiters, for split_safe."""
+    return re.compile(r"([<\[{(])|([>\]})])|" + re.escape(delim))
 
 
 def split_safe(s: str, delim: str) -> [str]:
+    """Split s at delim outside of brackets, e.g. "std::map<a::b, c>::iterator" into "std", "map<a::b, c>", "iterator".
+
+    Names without brackets are split by str.split, others by a compiled scanner that only visits
+    the brackets and delimiters.
+    """
+    if not s:
+        return []
+    if not BRACKETS.search(s):
+        return s.split(delim)
     tokens = []
-    i = 0
     last = 0
     inside = 0
-    while i < len(s):
-        c = s[i]
-        if i == len(s) - 1:
-            tokens.append(s[last : i + 1])
-        if c in ["<", "[", "{", "("]:
+    for match in _split_scanner(delim).finditer(s):
+        if match.lastindex == 1:
             inside += 1
-            i += 1
-            continue
-        if c in [">", "]", "}", ")"]:
+        elif match.lastindex == 2:
             inside -= 1
-            i += 1
-            continue
-        if inside > 0:
-            i += 1
-            continue
-        if contains(s, i, delim):
-            tokens.append(s[last:i])
-            i += 2
-            last = i
-        i += 1
+        elif inside <= 0:
+            tokens.append(s[last : match.start()])
+            last = match.end()
+    tokens.append(s[last:])
     return tokens
 
 
@@ -103,11 +100,35 @@ def recursive_find_with_parent(nodes, kinds, parent_kinds):
     for node in nodes:
         if node.kind in kinds and node.parent is not None and node.parent.kind in parent_kinds:
             ret.append(node)
-        if node.kind.is_parent() or node.kind.is_dir() or node.kind.is_file():
+        if node.kind.flag & CONTAINER_KINDS:
             ret.extend(recursive_find_with_parent(node.children, kinds, parent_kinds))
     return ret
 
 
+# def recursive_find_many(nodes: [Node], filters: [([Kind], [Kind])]) -> [[Node]]:
+def recursive_find_many(nodes, filters):
+    """One pass version of recursive_find_with_parent for several filters.
+    Each filter is a pair (kinds, parent_kinds), parent_kinds None matches any parent.
+    Returns one list of found nodes per filter, in the same order as recursive_find_with_parent.
+    """
+    found = [[] for _ in filters]
+    by_kind = {}
+    for index, (kinds, parent_kinds) in enumerate(filters):
+        for kind in kinds:
+            by_kind.setdefault(kind, []).append((index, parent_kinds))
+
+    def visit(nodes):
+        for node in nodes:
+            for index, parent_kinds in by_kind.get(node.kind, ()):
+                if parent_kinds is None or (node.parent is not None and node.parent.kind in parent_kinds):
+                    found[index].append(node)
+            if node.kind.flag & CONTAINER_KINDS:
+                visit(node.children)
+
+    visit(nodes)
+    return found
+
+
 def check_enabled_markdown_extensions(config: Config, mkdoxyConfig: Config) -> None:
     # sourcery skip: merge-nested-ifs
     """
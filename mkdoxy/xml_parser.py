@@ -21,6 +21,7 @@ from mkdoxy.markdown import (
     MdTableCell,
     MdTableRow,
     Text,
+    escape,
 )
 from mkdoxy.utils import lookahead
 
@@ -51,6 +52,9 @@ SIMPLE_SECTIONS = {
     "par": "\r\n",
 }
 
+# elements written by XmlParser.inline_md straight into the output, the others need the Md nodes of XmlParser.paras
+INLINE_TAGS = {"para", "bold", "emphasis", "computeroutput", "ref", "ulink", "image"}
+
 
 class XmlParser:
     def __init__(self, cache: Cache, debug: bool = False):
@@ -64,10 +68,68 @@ class XmlParser:
         if plain:
             return self.plain_as_str(p)
         renderer = MdRenderer()
-        for m in self.paras(p, italic=italic):
-            m.render(renderer, "")
+        if not self.inline_md(p, renderer, italic=italic):
+            renderer = MdRenderer()
+            renderer.render(self.paras(p, italic=italic))
         return renderer.output
 
+    def inline_md(self, p: Element, f: MdRenderer, italic: bool = False) -> bool:
+        """Write text with simple inline markup like paras would render it, without building Md nodes.
+
+        Returns False as soon as an element outside of INLINE_TAGS is found, the output is incomplete then.
+        """
+        if p is None:
+            return True
+        if p.text:
+            if italic:
+                f.write(f"_{escape(p.text.strip())}_ ")
+            else:
+                f.write(escape(p.text))
+        for item in p:
+            tag = item.tag
+            if tag not in INLINE_TAGS:
+                return False
+            if tag == "para":
+                if not self.inline_md(item, f):
+                    return False
+                f.eol()
+                f.write("\n")
+            elif tag == "bold" or tag == "emphasis":
+                mark = "**" if tag == "bold" else "_"
+                f.write(mark)
+                if not self.inline_md(item, f):
+                    return False
+                f.write(mark)
+            elif tag == "ulink":
+                f.write("[")
+                if not self.inline_md(item, f):
+                    return False
+                f.write(f"]({item.get('url')})")
+            elif tag == "computeroutput":
+                text = []
+                if item.text:
+                    text.append(item.text)
+                for i in item:
+                    text.extend(self.plain(i))
+                f.write(f"`{' '.join(text)}`")
+            elif tag == "image":
+                f.write(f"![Image]({item.get('name')})")
+            else:  # ref
+                try:
+                    ref = self.cache.get(item.get("refid"))
+                    name = escape(item.text or ref.get_full_name())
+                    f.write(f"[_**{name}**_]({ref.url})" if italic else f"[**{name}**]({ref.url})")
+                except Exception:
+                    if item.text:
+                        f.write(escape(item.text))
+
+            if item.tail:
+                if italic:
+                    f.write(f" _{escape(item.tail.strip())}_")
+                else:
+                    f.write(escape(item.tail))
+        return True
+
     def reference_as_str(self, p: Element) -> str:
         renderer = MdRenderer()
         refid = p.get("refid")
@@ -78,10 +140,13 @@ class XmlParser:
         return renderer.output
 
     def programlisting_as_str(self, p: Element) -> str:
-        renderer = MdRenderer()
-        for m in self.programlisting(p):
-            m.render(renderer, "")
-        return renderer.output
+        if p.tag != "programlisting":
+            return ""
+        return self.code_block_as_str(self.programlisting_code(p))
+
+    def code_block_as_str(self, code: str) -> str:
+        """Code block of plain code, like MdCodeBlock renders it after a line break."""
+        return f"\n```\n{code}```\n"
 
     def plain_as_str(self, p: Element) -> str:
         return " ".join(self.plain(p)).strip()
@@ -102,23 +167,38 @@ class XmlParser:
         ret = []
         # programlisting
         if p.tag == "programlisting":
-            code = MdCodeBlock([])
-            for codeline in p.findall("codeline"):
-                line = ""
-                for highlight in codeline.findall("highlight"):
-                    if highlight.text is not None:
-                        line += highlight.text
-                    for c in list(highlight):
-                        if c.tag == "sp":
-                            line += " "
-                        if c.text:
-                            line += c.text
-                        if c.tail:
-                            line += c.tail
-                code.append(line)
+            code = MdCodeBlock(self.programlisting_lines(p))
             ret.extend((Text("\n"), code))
         return ret
 
+    def programlisting_lines(self, p: Element) -> [str]:
+        return self.programlisting_code(p).split("\n")[:-1]
+
+    def programlisting_code(self, p: Element) -> str:
+        """Plain code of a programlisting, every line terminated by a newline.
+
+        The text of all lines is collected in one list and joined once.
+        """
+        parts = []
+        append = parts.append
+        for codeline in p:
+            if codeline.tag != "codeline":
+                continue
+            for highlight in codeline:
+                if highlight.tag != "highlight":
+                    continue
+                if highlight.text:
+                    append(highlight.text)
+                for c in highlight:
+                    if c.tag == "sp":
+                        append(" ")
+                    if c.text:
+                        append(c.text)
+                    if c.tail:
+                        append(c.tail)
+            append("\n")
+        return "".join(parts)
+
     def paras(self, p: Element, italic: bool = False) -> [Md]:
         ret = []
         if p is None:
@@ -0,0 +1,12 @@
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(items):
+    # the hook sees the items of all directories, mark only the benchmarks
+    for item in items:
+        if BENCHMARKS in item.path.parents:
+            item.add_marker(pytest.mark.benchmarks)
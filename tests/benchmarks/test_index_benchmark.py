@@ -0,0 +1,66 @@
+import pytest
+
+from mkdoxy.cache import Cache
+from mkdoxy.constants import Kind
+from mkdoxy.generatorBase import GeneratorBase
+from mkdoxy.node import Node
+from mkdoxy.project import ProjectContext
+from mkdoxy.utils import recursive_find_with_parent
+from mkdoxy.xml_parser import XmlParser
+
+pytest.importorskip("pytest_benchmark")
+
+METHODS = ["get", "size", "operator="]
+
+MEMBER = """
+      <memberdef kind="function" id="class{index}_1a{method_id}" prot="public" static="no" virt="non-virtual">
+        <type>int</type>
+        <definition>int Class{index}::{method}</definition>
+        <argsstring>()</argsstring>
+        <name>{method}</name>
+        <briefdescription></briefdescription>
+        <detaileddescription></detaileddescription>
+        <location file="src/classes.h" line="{index}" column="1"/>
+      </memberdef>"""
+
+CLASS = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.9.1">
+  <compounddef id="class{index}" kind="class" language="C++" prot="public">
+    <compoundname>Class{index}</compoundname>
+    <sectiondef kind="public-func">{members}
+    </sectiondef>
+    <briefdescription></briefdescription>
+    <detaileddescription></detaileddescription>
+    <location file="src/classes.h" line="{index}" column="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+def load_classes(path, count: int) -> [Node]:
+    """Doxygen model of `count` classes, all of them with the same method names."""
+    for index in range(count):
+        members = "".join(
+            MEMBER.format(index=index, method=method, method_id=method_id) for method_id, method in enumerate(METHODS)
+        )
+        (path / f"class{index}.xml").write_text(CLASS.format(index=index, members=members))
+
+    cache = Cache()
+    parser = XmlParser(cache=cache)
+    project = ProjectContext(cache)
+    root = Node("root", None, project, parser, None)
+    for index in range(count):
+        root.add_child(Node(str(path / f"class{index}.xml"), None, project, parser, root))
+    return root.children
+
+
+@pytest.mark.parametrize("count", [1_000, 10_000])
+def test_index_same_method_names(benchmark, tmp_path, count):
+    classes = load_classes(tmp_path, count)
+    generatorBase = GeneratorBase()
+    found = recursive_find_with_parent(classes, [Kind.FUNCTION], [Kind.CLASS])
+
+    output = benchmark.pedantic(
+        generatorBase.index_found, args=(found, "Class Member Functions", {}), rounds=3, iterations=1
+    )
+    assert output.count(f"Class{count - 1}") == len(METHODS)
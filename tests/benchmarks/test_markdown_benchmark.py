@@ -0,0 +1,38 @@
+from xml.etree import ElementTree
+
+import pytest
+
+from mkdoxy.cache import Cache
+from mkdoxy.xml_parser import XmlParser
+
+pytest.importorskip("pytest_benchmark")
+
+CODELINE = (
+    '<codeline lineno="{index}"><highlight class="keyword">int</highlight><highlight class="normal"><sp/>'
+    "value{index}<sp/>=<sp/>{index};</highlight></codeline>"
+)
+PARA = (
+    "<para>Paragraph {index} with <bold>bold</bold>, <emphasis>italic</emphasis>"
+    " and <computeroutput>code</computeroutput>.</para>"
+)
+
+
+@pytest.fixture
+def parser() -> XmlParser:
+    return XmlParser(cache=Cache())
+
+
+def test_programlisting_50k_lines(benchmark, parser):
+    listing = ElementTree.fromstring(
+        "<programlisting>" + "".join(CODELINE.format(index=index) for index in range(50_000)) + "</programlisting>"
+    )
+    output = benchmark.pedantic(parser.programlisting_as_str, args=(listing,), rounds=3, iterations=1)
+    assert output.count("\n") == 50_000 + 3
+
+
+def test_description_5k_paragraphs(benchmark, parser):
+    description = ElementTree.fromstring(
+        "<detaileddescription>" + "".join(PARA.format(index=index) for index in range(5_000)) + "</detaileddescription>"
+    )
+    output = benchmark.pedantic(parser.paras_as_str, args=(description,), rounds=3, iterations=1)
+    assert output.count("**bold**") == 5_000
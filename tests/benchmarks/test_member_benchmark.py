@@ -0,0 +1,58 @@
+import pytest
+
+from mkdoxy.cache import Cache
+from mkdoxy.generatorBase import GeneratorBase
+from mkdoxy.node import Node
+from mkdoxy.project import ProjectContext
+from mkdoxy.xml_parser import XmlParser
+
+pytest.importorskip("pytest_benchmark")
+
+MEMBER = """
+      <memberdef kind="function" id="classWidget_1a{index}" prot="public" static="no" virt="non-virtual">
+        <type>int</type>
+        <definition>int Widget::method{index}</definition>
+        <argsstring>(int value, const char *name)</argsstring>
+        <name>method{index}</name>
+        <param><type>int</type><declname>value</declname></param>
+        <param><type>const char *</type><declname>name</declname></param>
+        <briefdescription><para>Method number {index}.</para></briefdescription>
+        <detaileddescription><para>Uses <computeroutput>value</computeroutput> and <bold>name</bold>.</para>
+        </detaileddescription>
+        <location file="src/widget.h" line="{index}" column="1"/>
+      </memberdef>"""
+
+CLASS = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.9.1">
+  <compounddef id="classWidget" kind="class" language="C++" prot="public">
+    <compoundname>Widget</compoundname>
+    <sectiondef kind="public-func">{members}
+    </sectiondef>
+    <briefdescription><para>A widget.</para></briefdescription>
+    <detaileddescription></detaileddescription>
+    <location file="src/widget.h" line="1" column="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+@pytest.fixture
+def widget(tmp_path) -> Node:
+    """Doxygen model of a class with 50 documented methods."""
+    members = "".join(MEMBER.format(index=index) for index in range(50))
+    (tmp_path / "classWidget.xml").write_text(CLASS.format(members=members))
+
+    cache = Cache()
+    project = ProjectContext(cache)
+    root = Node("root", None, project, XmlParser(cache=cache), None)
+    node = Node(str(tmp_path / "classWidget.xml"), None, project, root._parser, root)
+    root.add_child(node)
+    return node
+
+
+def test_member_renders_per_second(benchmark, widget):
+    generatorBase = GeneratorBase()
+    config = {"indent_level": 0}
+
+    output = benchmark(generatorBase.member, widget, config)
+    assert output.count("### function method") == 50
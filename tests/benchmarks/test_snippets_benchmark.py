@@ -0,0 +1,50 @@
+import pytest
+
+from mkdoxy.generatorSnippets import GeneratorSnippets
+
+pytest.importorskip("pytest_benchmark")
+
+SNIPPET = """::: doxy.zoo.class.method
+    name: zoo::Animal{index}
+    method: get(int i)
+    indent_level: 2
+    disable_doxy_snippets: false
+
+Text between snippets.
+
+"""
+
+
+class Page:
+    url = "snippets/index.html"
+    canonical_url = url
+
+
+@pytest.fixture
+def page_markdown():
+    return "# Snippets\n\n" + "".join(SNIPPET.format(index=index) for index in range(500))
+
+
+def parse_snippets(generator: GeneratorSnippets):
+    snippets = generator.collect_snippets()
+    return [generator.try_load_yaml(snippet.yaml, snippet.project, snippet.code, {}) for snippet in snippets]
+
+
+def test_snippet_parsing(benchmark, page_markdown):
+    generator = GeneratorSnippets(
+        markdown=page_markdown,
+        generatorBase={},
+        doxygen={},
+        projects={"zoo": {}},
+        useDirectoryUrls=True,
+        page=Page(),
+        config={},
+    )
+    configs = benchmark(parse_snippets, generator)
+    assert len(configs) == 500
+    assert configs[0] == {
+        "name": "zoo::Animal0",
+        "method": "get(int i)",
+        "indent_level": 2,
+        "disable_doxy_snippets": False,
+    }
@@ -0,0 +1,33 @@
+import pytest
+
+from mkdoxy.markdown import escape
+from mkdoxy.utils import split_safe
+
+pytest.importorskip("pytest_benchmark")
+
+NAMES = [
+    "get_value",
+    "mkdoxy::Widget",
+    "std::map<std::pair<A,B>, C>::iterator",
+    "std::unordered_map<std::string, std::vector<std::shared_ptr<ns::Node>>>::const_iterator",
+    "boost::asio::basic_socket<Protocol, Executor>::async_connect(const endpoint_type &, ConnectHandler &&)",
+    "ns::detail::Array<int[ns::detail::size<T>::value]>::operator[]",
+]
+
+
+def split_all():
+    return [split_safe(name, "::") for name in NAMES]
+
+
+def escape_all():
+    return [escape(name) for name in NAMES]
+
+
+def test_split_safe_template_names(benchmark):
+    tokens = benchmark(split_all)
+    assert tokens[2] == ["std", "map<std::pair<A,B>, C>", "iterator"]
+
+
+def test_escape_template_names(benchmark):
+    escaped = benchmark(escape_all)
+    assert escaped[0] == "get\\_value"
@@ -0,0 +1,115 @@
+from xml.sax.saxutils import escape
+
+import pytest
+
+from mkdoxy.cache import Cache
+from mkdoxy.doxygen import Doxygen
+from mkdoxy.xml_parser import XmlParser
+
+COMPOUND = """<doxygen>
+  <compounddef id="{refid}" kind="{kind}" language="C++" prot="public">
+    <compoundname>{name}</compoundname>{refs}{sections}
+    <briefdescription>{brief}</briefdescription>
+    <detaileddescription></detaileddescription>
+    <location file="{location}" line="1" column="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+SECTION = """
+    <sectiondef kind="{kind}">{members}
+    </sectiondef>"""
+
+FUNCTION = """
+      <memberdef kind="function" id="{refid}" prot="public" static="no" virt="non-virtual">
+        <type>{type}</type>
+        <name>{name}</name>
+        <argsstring>{args}</argsstring>
+        <briefdescription></briefdescription>
+        <detaileddescription></detaileddescription>
+      </memberdef>"""
+
+# tag of the inner compound reference by the kind of the referenced compound
+INNER_TAGS = {"class": "innerclass", "struct": "innerclass", "file": "innerfile", "dir": "innerdir"}
+
+
+class DoxygenXml:
+    """Doxygen XML output of a small project, written to a directory and parsed on load.
+    Compounds are given by name, references to compounds of the project are linked by their refid.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.compounds = {}
+
+    def add(
+        self,
+        kind: str,
+        name: str,
+        refid: str = None,
+        bases: list = (),
+        derived: list = (),
+        inner: list = (),
+        functions: list = (),
+        brief: str = "",
+        location: str = "src/classes.h",
+    ) -> str:
+        """Add or replace a compound, functions are (type, name, args) tuples. Returns the refid of the compound."""
+        refid = refid or kind + name.replace("::", "_1_1")
+        self.compounds[name] = dict(
+            kind=kind,
+            refid=refid,
+            bases=bases,
+            derived=derived,
+            inner=inner,
+            functions=functions,
+            brief=brief,
+            location=location,
+        )
+        return refid
+
+    def ref(self, tag: str, name: str, prot: bool = False) -> str:
+        compound = self.compounds.get(name)
+        if compound is None:
+            return f"<{tag}>{escape(name)}</{tag}>"
+        attributes = f' refid="{compound["refid"]}"' + (' prot="public"' if prot else "")
+        return f"<{tag}{attributes}>{escape(name)}</{tag}>"
+
+    def write(self):
+        index = "".join(
+            f'<compound refid="{compound["refid"]}" kind="{compound["kind"]}"><name>{escape(name)}</name></compound>'
+            for name, compound in self.compounds.items()
+        )
+        (self.path / "index.xml").write_text(f"<doxygenindex>{index}</doxygenindex>")
+        for name, compound in self.compounds.items():
+            refs = "".join(self.ref("basecompoundref", base) for base in compound["bases"])
+            refs += "".join(self.ref("derivedcompoundref", child) for child in compound["derived"])
+            refs += "".join(
+                self.ref(INNER_TAGS[self.compounds[child]["kind"]], child, prot=True) for child in compound["inner"]
+            )
+            members = "".join(
+                FUNCTION.format(refid=f"{compound['refid']}_1{function}", type=type, name=function, args=args)
+                for type, function, args in compound["functions"]
+            )
+            sections = SECTION.format(kind="func", members=members) if members else ""
+            (self.path / f"{compound['refid']}.xml").write_text(
+                COMPOUND.format(
+                    refid=compound["refid"],
+                    kind=compound["kind"],
+                    name=escape(name),
+                    refs=refs,
+                    sections=sections,
+                    brief=f"<para>{compound['brief']}</para>" if compound["brief"] else "",
+                    location=compound["location"],
+                )
+            )
+
+    def load(self) -> Doxygen:
+        self.write()
+        cache = Cache()
+        return Doxygen(str(self.path), parser=XmlParser(cache=cache), cache=cache)
+
+
+@pytest.fixture
+def doxygen_xml(tmp_path) -> DoxygenXml:
+    return DoxygenXml(tmp_path)
@@ -0,0 +1,24 @@
+from mkdoxy.constants import COMPOUND_KINDS, CONTAINER_KINDS, OWN_PAGE_KINDS, Kind
+
+
+def test_kind_flags_are_distinct_bits():
+    flags = [kind.flag for kind in Kind]
+    assert len(set(flags)) == len(flags)
+    assert all(flag & (flag - 1) == 0 for flag in flags)
+
+
+def test_kind_categories():
+    parents = {Kind.NAMESPACE, Kind.CLASS, Kind.STRUCT, Kind.UNION, Kind.INTERFACE}
+    assert {kind for kind in Kind if kind.is_parent()} == parents
+    assert {kind for kind in Kind if kind.is_class_or_struct()} == {Kind.CLASS, Kind.STRUCT, Kind.INTERFACE}
+    assert {kind for kind in Kind if kind.flag & CONTAINER_KINDS} == parents | {Kind.FILE, Kind.DIR}
+    assert {kind for kind in Kind if kind.flag & COMPOUND_KINDS} == parents | {Kind.FILE, Kind.DIR, Kind.GROUP}
+    assert {kind for kind in Kind if kind.flag & OWN_PAGE_KINDS} == parents | {
+        Kind.FILE,
+        Kind.DIR,
+        Kind.GROUP,
+        Kind.PAGE,
+    }
+    for kind in Kind:
+        assert kind.is_member() == (kind.is_language() and kind not in parents)
+    assert not Kind.FILE.is_language()
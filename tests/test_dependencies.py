@@ -0,0 +1,49 @@
+from mkdoxy.dependencies import PageDependencies
+
+
+def write_project(doxygen_xml, base_brief="Base class."):
+    doxygen_xml.add("class", "Base", derived=["Derived"], brief=base_brief)
+    doxygen_xml.add("class", "Derived", bases=["Base"], brief="Derived class.")
+    doxygen_xml.add("class", "Other", brief="Unrelated.")
+
+
+def load(doxygen_xml) -> PageDependencies:
+    return PageDependencies(doxygen_xml.load(), str(doxygen_xml.path))
+
+
+def render(node, config):
+    return ""
+
+
+def test_dependencies_follow_base_classes(doxygen_xml):
+    write_project(doxygen_xml)
+    dependencies = load(doxygen_xml)
+    cache = dependencies.doxygen.ctx.cache
+
+    assert dependencies.dependencies(cache.get("classDerived")) == {"classDerived", "classBase"}
+    assert dependencies.dependencies(cache.get("classOther")) == {"classOther"}
+
+
+def test_fingerprint_changes_with_dependencies_only(doxygen_xml):
+    write_project(doxygen_xml)
+    before = load(doxygen_xml)
+    write_project(doxygen_xml, base_brief="Changed base class.")
+    after = load(doxygen_xml)
+
+    def fingerprints(dependencies: PageDependencies, refid: str):
+        node = dependencies.doxygen.ctx.cache.get(refid)
+        return dependencies.fingerprint(f"{refid}.md", render, (node, {}))
+
+    assert fingerprints(before, "classDerived") != fingerprints(after, "classDerived")
+    assert fingerprints(before, "classOther") == fingerprints(after, "classOther")
+    assert before.fingerprint("classes.md", render, ([], {})) != after.fingerprint("classes.md", render, ([], {}))
+
+
+def test_dependencies_follow_all_base_class_levels(doxygen_xml):
+    # C : B : A
+    for name, bases in (("A", []), ("B", ["A"]), ("C", ["B"])):
+        doxygen_xml.add("class", name, bases=bases, brief=f"{name}.")
+    dependencies = load(doxygen_xml)
+    cache = dependencies.doxygen.ctx.cache
+
+    assert dependencies.dependencies(cache.get("classC")) == {"classA", "classB", "classC"}
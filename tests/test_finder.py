@@ -0,0 +1,117 @@
+import pytest
+
+from mkdoxy.constants import Kind
+from mkdoxy.finder import Finder
+from mkdoxy.utils import recursive_find, recursive_find_with_parent
+
+
+class LinearFinder(Finder):
+    """Linear search over the node trees, as the finder worked before the lookup tables."""
+
+    def _doxyParent(self, project, parent: str, kind: Kind):
+        if not kind.is_parent():
+            return None
+        parents = recursive_find(self.doxygen[project].root.children, kind)
+        if parents:
+            for findParent in parents:
+                if findParent.name_long == parent:
+                    return findParent
+            return self.listToNames(parents)
+        return None
+
+    def _doxyMemberInParent(self, project, parent: str, parentKind: Kind, memberName: str, memberKind: Kind):
+        findParent = self._doxyParent(project, parent, parentKind)
+        if findParent:
+            if isinstance(findParent, list):
+                for member in findParent:
+                    if self._normalize(memberName) in self._normalize(member):
+                        return member
+                return findParent
+            else:
+                members = recursive_find(findParent.children, memberKind)
+                if members:
+                    for member in members:
+                        if self._normalize(memberName) in self._normalize(member.name_params):
+                            return member
+                    return self.listToNames(members)
+                return None
+        return None
+
+    def doxyFunction(self, project, functionName: str):
+        functions = recursive_find_with_parent(self.doxygen[project].files.children, [Kind.FUNCTION], [Kind.FILE])
+        if functions:
+            for function in functions:
+                if self._normalize(functionName) == self._normalize(function.name_params):
+                    return function
+            return self.listToNames(functions)
+        return None
+
+    def doxyCode(self, project, fileName):
+        files = recursive_find_with_parent(self.doxygen[project].files.children, [Kind.FILE], [Kind.DIR])
+        if files:
+            for file in files:
+                if self._normalize(fileName) == self._normalize(file.name_long):
+                    return file
+            return self.listToNames(files)
+        return None
+
+
+@pytest.fixture
+def finders(doxygen_xml):
+    doxygen_xml.add("class", "zoo::Animal", functions=[("void", "speak", "(int times)"), ("int", "age", "() const")])
+    doxygen_xml.add("class", "zoo::Bird", functions=[("void", "fly", "()"), ("void", "speak", "(int times)")])
+    doxygen_xml.add(
+        "namespace",
+        "zoo",
+        inner=["zoo::Animal", "zoo::Bird"],
+        functions=[("void", "feed", "(int count)"), ("void", "feed_all", "()")],
+    )
+    doxygen_xml.add(
+        "file",
+        "animal.h",
+        refid="animal_8h",
+        inner=["zoo::Animal"],
+        functions=[("int", "helper", "(const char *s)"), ("int", "parse", "(int n)")],
+        location="src/animal.h",
+    )
+    doxygen_xml.add("file", "bird.h", refid="bird_8h", functions=[("void", "nest", "()")], location="src/bird.h")
+    doxygen_xml.add("dir", "src", refid="dir_src", inner=["animal.h", "bird.h"], location="src/")
+
+    doxygen = {"zoo": doxygen_xml.load()}
+    return Finder(doxygen), LinearFinder(doxygen)
+
+
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("doxyClass", ["zoo::Animal"]),
+        ("doxyClass", ["zoo::Bird"]),
+        ("doxyClass", ["Animal"]),
+        ("doxyNamespace", ["zoo"]),
+        ("doxyNamespace", ["nope"]),
+        ("doxyClassMethod", ["zoo::Animal", "speak(int times)"]),
+        ("doxyClassMethod", ["zoo::Bird", "speak"]),
+        ("doxyClassMethod", ["zoo::Animal", "age()const"]),
+        ("doxyClassMethod", ["zoo::Animal", "fly"]),
+        ("doxyClassMethod", ["nope", "Animal"]),
+        ("doxyClassMethod", ["nope", "fly"]),
+        ("doxyNamespaceFunction", ["zoo", "feed"]),
+        ("doxyNamespaceFunction", ["zoo", "feed_all()"]),
+        ("doxyNamespaceFunction", ["zoo", "nope"]),
+        ("doxyFunction", ["int helper(const char *s)"]),
+        ("doxyFunction", ["int parse (int n)"]),
+        ("doxyFunction", ["void nest()"]),
+        ("doxyFunction", ["helper"]),
+        ("doxyCode", ["animal.h"]),
+        ("doxyCode", ["bird.h"]),
+        ("doxyCode", ["nope.h"]),
+    ],
+)
+def test_lookup_matches_linear_search(finders, method, args):
+    finder, linear = finders
+
+    found = getattr(finder, method)("zoo", *args)
+    expected = getattr(linear, method)("zoo", *args)
+    assert found == expected
+    if not isinstance(expected, list):
+        assert found is expected
@@ -0,0 +1,127 @@
+import pytest
+
+from mkdoxy.generatorAuto import GeneratorAuto
+from mkdoxy.generatorBase import GeneratorBase
+
+
+def generator(tmp_path, doxygen=None, **kwargs) -> GeneratorAuto:
+    return GeneratorAuto(
+        generatorBase=GeneratorBase(),
+        tempDoxyDir=str(tmp_path / "temp"),
+        siteDir=str(tmp_path / "site"),
+        apiPath="api",
+        doxygen=doxygen,
+        useDirectoryUrls=True,
+        **kwargs,
+    )
+
+
+rendered = []
+
+
+def page(text: str) -> str:
+    rendered.append(text)
+    return text
+
+
+def test_save_skips_unchanged_pages(tmp_path):
+    first = generator(tmp_path)
+    first.save("a.md", "# A")
+    first.save("b.md", "# B")
+    first.hashWrite()
+    assert first.changedFiles == {"api/a.md", "api/b.md"}
+
+    page = tmp_path / "temp" / "api" / "a.md"
+    mtime = page.stat().st_mtime_ns
+
+    second = generator(tmp_path)
+    second.save("a.md", "# A")
+    second.save("b.md", "# B changed")
+    assert second.changedFiles == {"api/b.md"}
+    assert page.stat().st_mtime_ns == mtime
+    assert (tmp_path / "temp" / "api" / "b.md").read_text() == "# B changed"
+    assert [file.src_uri for file in second.fullDocFiles] == ["api/a.md", "api/b.md"]
+
+
+def test_save_stream_matches_save(tmp_path):
+    first = generator(tmp_path)
+    first.save("a.md", "# A\nline")
+    first.hashWrite()
+
+    second = generator(tmp_path)
+    second.save("a.md", iter(["# A", "\nline"]))
+    second.save("b.md", iter(["# B"]))
+    assert second.changedFiles == {"api/b.md"}
+    assert second.hashes == {"api/a.md": first.hashes["api/a.md"], "api/b.md": second.hashes["api/b.md"]}
+    assert sorted(path.name for path in (tmp_path / "temp" / "api").iterdir()) == ["a.md", "b.md"]
+
+
+def test_failed_stream_keeps_the_page(tmp_path):
+    first = generator(tmp_path)
+    first.save("a.md", "# A")
+    first.hashWrite()
+
+    def chunks():
+        yield "# A changed"
+        raise RuntimeError("render failed")
+
+    second = generator(tmp_path)
+    with pytest.raises(RuntimeError):
+        second.save("a.md", chunks())
+    assert sorted(path.name for path in (tmp_path / "temp" / "api").iterdir()) == ["a.md"]
+    assert (tmp_path / "temp" / "api" / "a.md").read_text() == "# A"
+    assert second.changedFiles == set()
+
+
+def test_stream_normalizes_line_breaks_like_indent_filter(tmp_path):
+    (tmp_path / "index.jinja2").write_text(
+        "{% filter indent(config.get('indent_level', 0), True) %}{% for part in parts %}{{part}}{% endfor %}"
+        "{% endfilter %}\n"
+    )
+    generatorBase = GeneratorBase(templateDir=str(tmp_path))
+    template, _ = generatorBase.loadConfigAndTemplate("index")
+    assert template in generatorBase.streamTemplates
+
+    for parts in [["a\r", "\nb\rc\x0c"], ["x\r"], ["\r", "\r\n"], ["a\n", ""]]:
+        data = {"parts": parts, "config": {}}
+        expected = generatorBase.render(template, data)
+        with generatorBase.streaming():
+            assert "".join(generatorBase.render(template, data)) == expected
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_queued_page_is_rendered_once_from_its_last_job(tmp_path, parallel):
+    rendered.clear()
+    auto = generator(tmp_path, parallel=parallel, workers=2)
+    auto.jobs = []
+    auto.schedule("a.md", page, "# A first")
+    auto.schedule("b.md", page, "# B")
+    auto.schedule("a.md", page, "# A last")
+    auto.schedule("c.md", page, "# C")
+    auto.renderJobs()
+
+    # the page keeps the position of its first job, as pages were saved before the queue
+    assert [file.src_uri for file in auto.fullDocFiles] == ["api/a.md", "api/b.md", "api/c.md"]
+    assert (tmp_path / "temp" / "api" / "a.md").read_text() == "# A last"
+    assert auto.jobs is None
+    if not parallel:
+        assert rendered == ["# A last", "# B", "# C"]
+
+
+def test_parallel_pages_match_serial_pages(doxygen_xml, tmp_path):
+    doxygen_xml.add("class", "zoo::Animal", derived=["zoo::Bird"], functions=[("void", "speak", "(int times)")])
+    doxygen_xml.add("class", "zoo::Bird", bases=["zoo::Animal"], functions=[("void", "fly", "()")])
+    doxygen_xml.add("namespace", "zoo", inner=["zoo::Animal", "zoo::Bird"], functions=[("void", "feed", "()")])
+    doxygen_xml.add("file", "animal.h", refid="animal_8h", inner=["zoo::Animal"], location="src/animal.h")
+    doxygen_xml.add("dir", "src", refid="dir_src", inner=["animal.h"], location="src/")
+    doxygen = doxygen_xml.load()
+
+    pages = {}
+    for parallel in [False, True]:
+        auto = generator(tmp_path / str(parallel), doxygen, parallel=parallel, workers=2)
+        auto.fullDoc({})
+        pages[parallel] = {file.src_uri: open(file.abs_src_path, "rb").read() for file in auto.fullDocFiles}
+
+    assert len(pages[False]) > 10
+    assert list(pages[True]) == list(pages[False])
+    assert pages[True] == pages[False]
@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from mkdoxy.generatorBase import GeneratorBase
+from mkdoxy.generatorSnippets import (
+    SNIPPET_INCORRECT,
+    SNIPPET_LONG,
+    SNIPPET_SHORT,
+    GeneratorSnippets,
+    load_flat_yaml,
+)
+
+
+@pytest.mark.parametrize(
+    "yaml_raw",
+    [
+        "",
+        "\n",
+        "    name: zoo::Animal",
+        "    name: zoo::Animal\n    method: get(int i)\n",
+        "name: Foo\nindent_level: 4\nstart: 0\nend: -12",
+        "file: src/animal.h\nstart: 3\nend: 5",
+        "disable_doxy_snippets: true\nbrief: False\nlinks: yes\nsource: OFF",
+        "name: ~\ndetails:\nparam: null",
+        "name: operator==(const Animal &other)",
+        "name: First\nname: Second",
+        "name: std::vector< int >",
+    ],
+)
+def test_load_flat_yaml_matches_yaml(yaml_raw):
+    assert load_flat_yaml(yaml_raw) == (yaml.safe_load(yaml_raw) or {})
+
+
+@pytest.mark.parametrize(
+    "yaml_raw",
+    [
+        "name: 'quoted'",
+        'name: "quoted"',
+        "name: Foo # comment",
+        "ratio: 1.5",
+        "start: 007",
+        "name: a: b",
+        "name: Foo:",
+        "yes: true",
+        "config:\n  name: Foo",
+        "  name: Foo\n name: Bar",
+        "\tname: Foo",
+        "name: Foo\r\n",
+        "name: Zoë",
+        "list: [1, 2]",
+        "- name",
+    ],
+)
+def test_load_flat_yaml_falls_back(yaml_raw):
+    assert load_flat_yaml(yaml_raw) is None
+
+
+def generator(markdown: str, config: dict = None) -> GeneratorSnippets:
+    snippets = GeneratorSnippets(
+        markdown=markdown,
+        generatorBase={"proj": GeneratorBase()},
+        doxygen={},
+        projects={"proj": {}},
+        useDirectoryUrls=False,
+        page=SimpleNamespace(url="a/b/", canonical_url="https://example.com/a/b/"),
+        config=config or {},
+    )
+    snippets.calls = []
+
+    def call_doxy_by_name(snippet, project, argument, config):
+        snippets.calls.append((argument, config.get("name")))
+        return f"<{argument}>"
+
+    snippets.call_doxy_by_name = call_doxy_by_name
+    return snippets
+
+
+def test_incorrect_snippet_takes_precedence_over_overlapping_ones():
+    snippets = generator("::: doxy.proj\n::: doxy.proj.class\n\ntext\n")
+
+    assert [snippet.kind for snippet in snippets.collect_snippets()] == [SNIPPET_INCORRECT]
+    assert "Add argument to snippet: proj" in snippets.generate()
+    assert snippets.calls == []
+
+
+def test_short_snippet_takes_precedence_over_long_one():
+    snippets = generator("::: doxy.proj.class.list\n\n::: doxy.proj.class\n    name: A\n\ntext\n")
+
+    assert [(snippet.kind, snippet.code) for snippet in snippets.collect_snippets()] == [
+        (SNIPPET_SHORT, "::: doxy.proj.class.list\n\n"),
+        (SNIPPET_LONG, "::: doxy.proj.class\n    name: A\n"),
+    ]
+    assert snippets.generate() == "<class.list>\n<class>\n\ntext\n"
+    assert snippets.calls == [("class.list", None), ("class", "A")]
+
+
+def test_duplicate_snippets_are_rendered_once():
+    snippets = generator("text\n\n::: doxy.proj.class.list\n\n::: doxy.proj.class.list\n\n")
+
+    assert len(snippets.collect_snippets()) == 2
+    assert len({snippet.key for snippet in snippets.collect_snippets()}) == 1
+    assert snippets.generate() == "text\n\n<class.list>\n<class.list>\n"
+    assert snippets.calls == [("class.list", None)]
+
+
+def test_disabled_long_snippet_is_left_unchanged():
+    markdown = "::: doxy.proj.class\n    name: A\n    disable_doxy_snippets: true\n\n::: doxy.proj.class\n    name: B\n"
+    snippets = generator(markdown)
+
+    assert snippets.generate() == "::: doxy.proj.class\n    name: A\n    disable_doxy_snippets: true\n\n<class>\n"
+    assert snippets.calls == [("class", "B")]
+
+
+def test_disabled_page_is_left_unchanged():
+    markdown = "::: doxy.proj.class.list\n\n::: doxy.nope\n"
+    snippets = generator(markdown, {"disable_doxy_snippets": True})
+
+    assert snippets.generate() == markdown
+    assert snippets.calls == []
+
+
+@pytest.mark.parametrize(
+    "markdown", ["::: doxy.nope\n\n", "::: doxy.nope\n    name: A\n", "::: doxy.nope.class.list\n"]
+)
+def test_unknown_project_is_an_error(markdown):
+    snippets = generator(markdown)
+
+    assert "Incorrect project name: nope" in snippets.generate()
+    assert snippets.calls == []
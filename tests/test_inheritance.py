@@ -0,0 +1,43 @@
+from mkdoxy.generatorBase import GeneratorBase
+
+# Diamond A <- B, C <- D, B also derives from the undocumented std::Ext
+CLASSES = {
+    "A": ([], ["B", "C"]),
+    "B": (["A", "std::Ext"], ["D"]),
+    "C": (["A"], ["D"]),
+    "D": (["B", "C"], []),
+}
+
+
+def load(doxygen_xml):
+    for name, (bases, derived) in CLASSES.items():
+        doxygen_xml.add("class", name, bases=bases, derived=derived)
+    return doxygen_xml.load()
+
+
+def test_graph_edges(doxygen_xml):
+    doxygen = load(doxygen_xml)
+    cache = doxygen.ctx.cache
+
+    assert cache.get("classB").base_classes == [cache.get("classA"), "std::Ext"]
+    assert cache.get("classA").derived_classes == [cache.get("classB"), cache.get("classC")]
+    assert not cache.get("classA").has_base_classes
+    assert not cache.get("classD").has_derived_classes
+
+
+def test_roots_visit_each_class_once(doxygen_xml):
+    doxygen = load(doxygen_xml)
+    cache = doxygen.ctx.cache
+
+    roots, external = doxygen.ctx.inheritance.roots(["classD", "classC", "classB", "classA"])
+    assert roots == ["classA"]
+    assert external == {"std::Ext": [cache.get("classB")]}
+
+
+def test_hierarchy_lists_roots_once(doxygen_xml):
+    doxygen = load(doxygen_xml)
+
+    output = GeneratorBase().hierarchy(doxygen.root.children)
+    assert output.count("**A**") == 1
+    assert output.count("**std::Ext**") == 1
+    assert output.index("**A**") < output.index("**std::Ext**")
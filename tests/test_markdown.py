@@ -0,0 +1,67 @@
+import pytest
+
+from mkdoxy.markdown import (
+    Code,
+    MdBlockEquation,
+    MdBold,
+    MdHeader,
+    MdItalic,
+    MdLink,
+    MdList,
+    MdNode,
+    MdParagraph,
+    MdRenderer,
+    MdTable,
+    MdTableCell,
+    MdTableRow,
+    Text,
+)
+
+
+def render(nodes) -> str:
+    renderer = MdRenderer()
+    renderer.render(nodes)
+    return renderer.output
+
+
+def test_render_inline_and_lists():
+    nodes = [
+        MdHeader(2, [Text("Title *x*")]),
+        MdParagraph([Text("a_b "), MdBold([Text("bold"), MdItalic([Text("it")])]), MdLink([Code("c")], "u.md")]),
+        MdList(
+            [
+                MdParagraph([Text("one")]),
+                MdList([MdParagraph([Text("nested")]), MdBlockEquation("x^2")]),
+                MdParagraph([Text("two")]),
+            ]
+        ),
+    ]
+    assert render(nodes) == (
+        "## Title \\*x\\*\n\na\\_b **bold_it_**[`c`](u.md)\n* one\n  * nested\n  * \n    \\[x^2\\]\n* two\n"
+    )
+
+
+def test_render_table():
+    table = MdTable()
+    table.append(MdTableRow([MdTableCell([Text("A")]), MdTableCell([Text("B|")])]))
+    table.append(MdTableRow([MdTableCell([Text("1")]), MdTableCell([Text("2")])]))
+    assert render([Text("before"), table, MdParagraph([Text("after")])]) == (
+        "before\n|A|B\\||\n|-----|-----|\n|1|2|\n\n\nafter\n"
+    )
+
+
+def test_render_deep_nesting_without_recursion():
+    node = Text("deep")
+    for _ in range(20_000):
+        node = MdBold([node])
+    assert render([node]) == "**" * 20_000 + "deep" + "**" * 20_000
+
+
+def test_nodes_have_slots():
+    assert not hasattr(MdParagraph([]), "__dict__")
+    assert not hasattr(Text(""), "__dict__")
+
+
+def test_nodes_without_steps_are_abstract():
+    with pytest.raises(TypeError):
+        MdNode()
@@ -0,0 +1,88 @@
+import mkdoxy.node
+from mkdoxy.constants import Kind
+from mkdoxy.doxygen import Doxygen
+
+MAP = "ns::Map< std::pair< a::b, c > >"
+
+
+def load(doxygen_xml) -> Doxygen:
+    doxygen_xml.add("namespace", "ns", inner=[MAP])
+    doxygen_xml.add("class", MAP, refid="classns_1_1Map", functions=[("int", "get_value", "()")])
+    return doxygen_xml.load()
+
+
+def test_names(doxygen_xml):
+    cache = load(doxygen_xml).ctx.cache
+    klass = cache.get("classns_1_1Map")
+    member = cache.get("classns_1_1Map_1get_value")
+
+    assert klass.name_tokens == ["ns", "Map< std::pair< a::b, c > >"]
+    assert klass.name_short == "Map&lt; std::pair&lt; a::b, c &gt; &gt;"
+    assert klass.name_long == "ns::Map&lt; std::pair&lt; a::b, c &gt; &gt;"
+    assert member.name_long == "ns::Map&lt; std::pair&lt; a::b, c &gt; &gt;::get\\_value"
+    assert member.name_url_safe == "get_value"
+
+
+def test_names_are_computed_once(doxygen_xml, monkeypatch):
+    cache = load(doxygen_xml).ctx.cache
+    calls = []
+    split_safe = mkdoxy.node.split_safe
+    monkeypatch.setattr(mkdoxy.node, "split_safe", lambda s, delim: calls.append(s) or split_safe(s, delim))
+
+    member = cache.get("classns_1_1Map_1get_value")
+    for _ in range(3):
+        assert member.name_long
+        assert member.name_full_unescaped
+        assert member.name_short
+    # the member and its class, each split once
+    assert calls == ["get_value", "ns::Map< std::pair< a::b, c > >"]
+
+
+def test_kind_checks(doxygen_xml):
+    cache = load(doxygen_xml).ctx.cache
+    klass = cache.get("classns_1_1Map")
+    member = cache.get("classns_1_1Map_1get_value")
+
+    assert klass.is_class and klass.is_parent and klass.is_class_or_struct and klass.is_language
+    assert member.is_function and member.is_language and not member.is_parent
+    assert klass.flags == Kind.CLASS.flag
+    assert member.url == "classns_1_1Map.md#function-get_value"
+
+
+def test_query_children(doxygen_xml):
+    cache = load(doxygen_xml).ctx.cache
+    klass = cache.get("classns_1_1Map")
+    member = cache.get("classns_1_1Map_1get_value")
+
+    assert klass.query("public", ["function"], False) == (member,)
+    assert klass.query("public", ["function"], False) is klass.query("public", ["function"], False)
+    assert klass.has("public", ["enum", "function"], False)
+    assert not klass.has("public", ["function"], True)
+    assert not klass.has("private", ["function"], False)
+
+    klass.add_child(klass.remove_child(0))
+    assert klass.query("public", ["variable", "function"], False) == (member,)
+
+
+def test_parents_root_and_url(doxygen_xml):
+    doxygen = load(doxygen_xml)
+    klass = doxygen.ctx.cache.get("classns_1_1Map")
+    member = doxygen.ctx.cache.get("classns_1_1Map_1get_value")
+
+    assert member.parents == (klass, member)
+    assert member.root is doxygen.root
+    assert member.url == "classns_1_1Map.md#function-get_value"
+
+    # snippets link to the same pages from other directories
+    doxygen.ctx.linkPrefix = "../api/"
+    assert member.url == "../api/classns_1_1Map.md#function-get_value"
+    assert klass.url == "../api/classns_1_1Map.md"
+
+
+def test_codeblock_is_built_once(doxygen_xml):
+    member = load(doxygen_xml).ctx.cache.get("classns_1_1Map_1get_value")
+
+    assert member.codeblock.startswith("```\nint ")
+    assert member.codeblock.endswith("::get_value () \n```")
+    assert member.codeblock is member.codeblock
+    assert member.name_params is member.name_params
@@ -0,0 +1,77 @@
+import logging
+import os
+import sys
+
+import pytest
+
+import mkdoxy.parallel
+from mkdoxy.parallel import _RecordCollector, fork_available, map_parallel
+from mkdoxy.renderStats import RenderStats
+
+log = logging.getLogger("mkdocs")
+
+needs_fork = pytest.mark.skipif(not fork_available(), reason="worker processes are forked on Linux only")
+
+
+@needs_fork
+def test_results_in_job_order():
+    assert map_parallel(lambda index: (index, index * index), 50, workers=4) == [(i, i * i) for i in range(50)]
+
+
+@needs_fork
+def test_jobs_run_in_workers():
+    pids = map_parallel(lambda index: os.getpid(), 8, workers=2)
+    assert os.getpid() not in pids
+
+
+@needs_fork
+def test_worker_records_are_replayed(caplog):
+    def task(index: int) -> int:
+        log.warning("job %d", index)
+        return index
+
+    with caplog.at_level(logging.INFO, logger="mkdocs"):
+        assert map_parallel(task, 4, workers=2) == [0, 1, 2, 3]
+    assert sorted(record.getMessage() for record in caplog.records) == ["job 0", "job 1", "job 2", "job 3"]
+    assert all(record.levelno == logging.WARNING for record in caplog.records)
+
+
+@pytest.mark.parametrize("fork", [True, False])
+def test_worker_stats_are_merged(monkeypatch, fork):
+    if fork and not fork_available():
+        pytest.skip("worker processes are forked on Linux only")
+    monkeypatch.setattr(mkdoxy.parallel, "fork_available", lambda: fork)
+    stats = RenderStats()
+
+    def task(index: int) -> int:
+        stats.record(("page", "job", "-"), 0.5, index)
+        return index
+
+    assert map_parallel(task, 4, workers=2, stats=stats) == [0, 1, 2, 3]
+    assert sorted(size for _, size in stats.samples[("page", "job", "-")]) == [0, 1, 2, 3]
+
+
+def test_record_collector_formats_records():
+    collector = _RecordCollector()
+    try:
+        raise ValueError("broken")
+    except ValueError:
+        record = log.makeRecord("mkdocs", logging.ERROR, __file__, 1, "page %s", ("a.md",), sys.exc_info())
+    mkdoxy.parallel._records.clear()
+    collector.emit(record)
+
+    [collected] = mkdoxy.parallel._records
+    assert collected.msg == "page a.md" and collected.args is None
+    assert collected.exc_info is None and "ValueError: broken" in collected.exc_text
+    mkdoxy.parallel._records.clear()
+
+
+@pytest.mark.parametrize("workers, fork", [(1, True), (4, False)])
+def test_serial_fallback(monkeypatch, workers, fork):
+    monkeypatch.setattr(mkdoxy.parallel, "fork_available", lambda: fork)
+    assert map_parallel(lambda index: (index, os.getpid()), 3, workers=workers) == [(i, os.getpid()) for i in range(3)]
+
+
+def test_fork_only_on_linux(monkeypatch):
+    monkeypatch.setattr(mkdoxy.parallel.sys, "platform", "darwin")
+    assert not fork_available()
@@ -0,0 +1,53 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from mkdoxy.plugin import MkDoxy
+
+
+def plugin(**config) -> MkDoxy:
+    mkdoxy = MkDoxy()
+    mkdoxy.config = {"enabled": True, "parallel-snippets": True, "parallel-full-doc": True, **config}
+    mkdoxy.renderedSnippets = {}
+    return mkdoxy
+
+
+def page(src_uri: str):
+    return SimpleNamespace(file=SimpleNamespace(src_uri=src_uri), meta={})
+
+
+def test_page_markdown_uses_prerendered_snippets(monkeypatch):
+    mkdoxy = plugin()
+    rendered = []
+    monkeypatch.setattr(mkdoxy, "generateSnippets", lambda markdown, *args: rendered.append(markdown) or "serial")
+    mkdoxy.renderedSnippets["a.md"] = ("::: doxy.p.class", "pre-rendered")
+
+    assert mkdoxy.on_page_markdown("::: doxy.p.class", page("a.md"), {}, None) == "pre-rendered"
+    assert rendered == []
+
+    # another plugin changed the markdown after it was pre-rendered
+    assert mkdoxy.on_page_markdown("changed\n::: doxy.p.class", page("a.md"), {}, None) == "serial"
+    assert mkdoxy.on_page_markdown("::: doxy.p.class", page("b.md"), {}, None) == "serial"
+    assert rendered == ["changed\n::: doxy.p.class", "::: doxy.p.class"]
+
+
+def test_parallel_is_serial_in_serve():
+    mkdoxy = plugin(**{"parallel-full-doc": False})
+    mkdoxy.on_startup(command="build", dirty=False)
+    assert mkdoxy.parallel("parallel-snippets")
+    assert not mkdoxy.parallel("parallel-full-doc")
+
+    mkdoxy.on_startup(command="serve", dirty=False)
+    assert not mkdoxy.parallel("parallel-snippets")
+
+
+@pytest.mark.parametrize("save_api, warnings", [("", 1), ("api", 0)])
+def test_incremental_without_save_api_warns(tmp_path, monkeypatch, caplog, save_api, warnings):
+    monkeypatch.chdir(tmp_path)
+    mkdoxy = plugin(
+        **{"projects": {}, "incremental": True, "save-api": save_api, "render-stats": False, "render-stats-file": ""}
+    )
+    with caplog.at_level(logging.WARNING, logger="mkdocs"):
+        assert mkdoxy.on_files([], {"site_dir": str(tmp_path / "site")}) == []
+    assert len([record for record in caplog.records if "'incremental' needs 'save-api'" in record.message]) == warnings
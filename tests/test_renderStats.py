@@ -0,0 +1,74 @@
+import json
+
+from jinja2 import Environment, Template
+
+from mkdoxy.generatorAuto import GeneratorAuto
+from mkdoxy.generatorBase import GeneratorBase
+from mkdoxy.renderStats import RenderStats, TimedTemplate, percentile
+
+
+def test_percentile_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 95) == 95.0
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_timed_records_produced_chunks():
+    stats = RenderStats()
+    assert "".join(stats.timed(("page", "member", "class"), iter(["a", "ä"]))) == "aä"
+    assert [(key, size) for key, [(_, size)] in stats.samples.items()] == [(("page", "member", "class"), 3)]
+
+
+def test_collect_keeps_samples_apart():
+    stats = RenderStats()
+    stats.record(("template", "index", "-"), 1.0, 10)
+
+    def job():
+        stats.record(("template", "member", "class"), 2.0, 20)
+        return "output"
+
+    output, samples = stats.collect(job)
+    assert output == "output"
+    assert list(stats.samples) == [("template", "index", "-")]
+
+    stats.merge(samples)
+    assert [row["name"] for row in stats.rows()] == ["member", "index"]
+
+
+def test_render_and_save_are_recorded(tmp_path):
+    stats = RenderStats()
+    generatorBase = GeneratorBase(stats=stats)
+    generatorAuto = GeneratorAuto(
+        generatorBase=generatorBase,
+        tempDoxyDir=str(tmp_path / "temp"),
+        siteDir=str(tmp_path / "site"),
+        apiPath="api",
+        doxygen=None,
+        useDirectoryUrls=True,
+    )
+    generatorAuto.index_found([], "Class Members", {})
+    with generatorBase.streaming():
+        generatorAuto.index_found([], "Class Members", {})
+
+    rows = {(row["section"], row["name"]): row for row in stats.rows()}
+    assert rows["template", "index"]["count"] == 2
+    assert rows["page", "index_found"]["count"] == 2
+    assert rows["page", "index_found"]["bytes"] == 2 * len(generatorBase.index_found([], "Class Members", {}))
+
+    stats.dump(str(tmp_path / "stats.json"))
+    assert len(json.loads((tmp_path / "stats.json").read_text())) == len(rows)
+
+
+def test_timed_template_is_a_template():
+    stats = RenderStats()
+    environment = Environment()
+    nested = environment.from_string("{% macro greet(name) %}Hi {{ name }}{% endmacro %}[{{ node }}]")
+    timed = TimedTemplate(nested, "memTab", stats)
+
+    assert isinstance(timed, Template)
+    assert timed.render({"node": "x"}) == "[x]"
+    assert "".join(timed.generate(node="y")) == "[y]"
+    assert timed.module.greet("you") == "Hi you"
+    outer = environment.from_string("{% include nested %}|{% import nested as m %}{{ m.greet('me') }}")
+    assert outer.render(nested=timed, node="z") == "[z]|Hi me"
+    assert [key for key in stats.samples] == [("template", "memTab", "-")]
@@ -0,0 +1,46 @@
+from mkdoxy.source import MappedSource, SourceFiles, SourceLines
+
+
+def test_source_lines_slice():
+    source = SourceLines("one\ntwo\nthree\nfour\n")
+
+    assert len(source) == 4
+    assert source.lines(2, 3) == "two\nthree\n"
+    assert source.lines(3) == "three\nfour\n"
+    assert source.lines() == "one\ntwo\nthree\nfour\n"
+    assert source.lines(4, 10) == "four\n"
+    assert source.lines(5) == ""
+
+
+def test_source_lines_without_trailing_newline():
+    source = SourceLines("one\ntwo")
+
+    assert len(source) == 2
+    assert source.lines(2, 2) == "two\n"
+    assert SourceLines("").lines() == ""
+
+
+def test_mapped_source(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.cpp").write_bytes(b"int a;\r\nint b;\r\nint c;\r\n")
+    (tmp_path / "empty.h").write_bytes(b"")
+    sources = SourceFiles("src", baseDir=str(tmp_path))
+
+    source = sources.get("main.cpp")
+    assert isinstance(source, MappedSource)
+    assert len(source) == 3
+    assert source.lines(2, 3) == "int b;\nint c;\n"
+    assert sources.get("empty.h").lines() == ""
+    assert sources.get("missing.h") is None
+
+
+def test_close_mapped_sources(tmp_path):
+    (tmp_path / "main.cpp").write_bytes(b"int a;\n")
+    sources = SourceFiles("", baseDir=str(tmp_path))
+    source = sources.get("main.cpp")
+    assert sources.get("missing.h") is None
+
+    sources.close()
+    assert source.text.closed
+    assert sources.files == {}
+    assert sources.get("main.cpp").lines() == "int a;\n"
@@ -0,0 +1,53 @@
+from mkdoxy.generatorBase import GeneratorBase
+from mkdoxy.templateRegistry import TemplateRegistry, templateRegistry
+
+
+def test_projects_share_compiled_templates(tmp_path):
+    (tmp_path / "index.jinja2").write_text("# {{title}}")
+    first = GeneratorBase()
+    second = GeneratorBase(templateDir=str(tmp_path))
+
+    assert second.templates["member"] is first.templates["member"]
+    assert second.templates["index"] is not first.templates["index"]
+    assert second.templates["index"].render(title="Custom") == "# Custom"
+    assert GeneratorBase(templateDir=str(tmp_path)).templates["index"] is second.templates["index"]
+
+
+def test_bytecode_cache_on_disk(tmp_path, monkeypatch):
+    source = "---\nheader: False\n---\n{% filter indent(config.get('indent_level', 0), True) %}{{title}}{% endfilter %}"
+    template, metaData, streamTemplate = TemplateRegistry().load("index", source)
+    assert metaData == {"header": False}
+    assert streamTemplate is not None
+
+    registry = TemplateRegistry()
+    registry.useCacheDir(str(tmp_path))
+    registry.load("index", source)
+    assert len(list(tmp_path.iterdir())) == 2  # the template and its stream variant
+
+    # a new process (registry) loads the compiled code from the cache directory
+    cached = TemplateRegistry()
+    cached.useCacheDir(str(tmp_path))
+    monkeypatch.setattr(cached.environment, "compile", None)
+    template, _, _ = cached.load("index", source)
+    assert template.render(title="A", config={}) == "A"
+    assert templateRegistry.defaults() is templateRegistry.defaults()
+
+
+def test_changed_template_replaces_its_entry(tmp_path):
+    registry = TemplateRegistry()
+    first, _, _ = registry.load("index", "# {{title}}")
+    assert registry.load("index", "# {{title}}")[0] is first
+
+    changed, _, _ = registry.load("index", "## {{title}}")
+    assert changed is not first
+    assert changed.render(title="A") == "## A"
+    assert list(registry.loaded) == ["index"]
+    assert registry.sources == {}
+
+
+def test_bytecode_cache_only_with_directory(tmp_path):
+    registry = TemplateRegistry()
+    registry.useCacheDir(str(tmp_path))
+    registry.useCacheDir("")
+    registry.load("index", "# {{title}}")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,31 @@
+import pytest
+
+from mkdoxy.markdown import escape
+from mkdoxy.utils import split_safe
+
+
+@pytest.mark.parametrize(
+    "name, tokens",
+    [
+        ("", []),
+        ("Widget", ["Widget"]),
+        ("ns::Widget", ["ns", "Widget"]),
+        ("a::b", ["a", "b"]),
+        ("std::map<std::pair<A,B>, C>::iterator", ["std", "map<std::pair<A,B>, C>", "iterator"]),
+        ("ns::Widget<T, std::vector<int>>::operator()", ["ns", "Widget<T, std::vector<int>>", "operator()"]),
+        ("ns::apply(std::function<void(a::b)>)", ["ns", "apply(std::function<void(a::b)>)"]),
+        ("ns::Array<int[a::size]>::data", ["ns", "Array<int[a::size]>", "data"]),
+        ("ns::operator<", ["ns", "operator<"]),
+        ("ns::operator->::x", ["ns", "operator->", "x"]),
+    ],
+)
+def test_split_safe(name, tokens):
+    assert split_safe(name, "::") == tokens
+
+
+def test_split_safe_other_delimiter():
+    assert split_safe("dir/sub<a/b>/file.h", "/") == ["dir", "sub<a/b>", "file.h"]
+
+
+def test_escape():
+    assert escape("a_b*c<T>|d") == "a\\_b\\*c&lt;T&gt;\\|d"
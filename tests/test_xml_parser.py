@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from xml.etree import ElementTree
+
+import pytest
+
+from mkdoxy.cache import Cache
+from mkdoxy.markdown import MdRenderer
+from mkdoxy.xml_parser import XmlParser
+
+DESCRIPTIONS = [
+    "<briefdescription><para>Plain text with *stars*, under_scores and a|pipe. </para></briefdescription>",
+    "<briefdescription>\n<para>First</para>\n<para>Second</para>\n</briefdescription>",
+    "<para>A <bold>bold <emphasis>nested</emphasis></bold> and <computeroutput>co<sp/>de</computeroutput>.</para>",
+    '<para>See <ref refid="classFoo" kindref="compound">Foo</ref>, <ref refid="classFoo" kindref="compound"/>'
+    ' and <ref refid="missing">Missing</ref>.</para>',
+    '<para><ulink url="https://example.com">link <bold>text</bold></ulink> <image type="html" name="a.png"/></para>',
+    '<type>const <ref refid="classFoo">Foo</ref> &amp;</type>',
+    "<para>Text <linebreak/> tail</para>",
+    "<para>List:<itemizedlist><listitem><para>one</para></listitem></itemizedlist></para>",
+    '<para>Equation <formula id="0">$x^2$</formula></para>',
+    "<para><bold>bold with <itemizedlist><listitem><para>list</para></listitem></itemizedlist></bold></para>",
+]
+
+
+@pytest.fixture
+def parser() -> XmlParser:
+    cache = Cache()
+    cache.add("classFoo", SimpleNamespace(url="foo.md#classfoo", get_full_name=lambda: "ns::Foo"))
+    return XmlParser(cache=cache)
+
+
+def render_nodes(parser: XmlParser, p, italic: bool) -> str:
+    renderer = MdRenderer()
+    renderer.render(parser.paras(p, italic=italic))
+    return renderer.output
+
+
+@pytest.mark.parametrize("italic", [False, True])
+@pytest.mark.parametrize("xml", DESCRIPTIONS)
+def test_paras_as_str_matches_md_nodes(parser, xml, italic):
+    p = ElementTree.fromstring(xml)
+    assert parser.paras_as_str(p, italic=italic) == render_nodes(parser, p, italic)
+
+
+def test_inline_md_stops_at_complex_elements(parser):
+    simple = ElementTree.fromstring("<para>Text <bold>bold</bold></para>")
+    table = ElementTree.fromstring("<para><table><row><entry><para>a</para></entry></row></table></para>")
+    assert parser.inline_md(simple, MdRenderer())
+    assert not parser.inline_md(table, MdRenderer())
+
+
+LISTING = (
+    '<programlisting><codeline lineno="1"><highlight class="keyword">int</highlight><highlight class="normal"><sp/>'
+    '<ref refid="classFoo">value</ref><sp/>=<sp/>1;</highlight></codeline>'
+    '<codeline lineno="2"></codeline>'
+    '<codeline lineno="3"><highlight class="comment">//<sp/>a|b<sp/>*c*</highlight></codeline></programlisting>'
+)
+
+
+def test_programlisting_code(parser):
+    listing = ElementTree.fromstring(LISTING)
+    assert parser.programlisting_code(listing) == "int value = 1;\n\n// a|b *c*\n"
+    assert parser.programlisting_lines(listing) == ["int value = 1;", "", "// a|b *c*"]
+    assert parser.programlisting_as_str(listing) == "\n```\nint value = 1;\n\n// a|b *c*\n```\n"
+    renderer = MdRenderer()
+    renderer.render(parser.programlisting(listing))
+    assert parser.programlisting_as_str(listing) == renderer.output